@@ -22,19 +22,40 @@ class FPPOutput:
         self.width = width
         self.height = height
         self.buffer_size = width * height * 3
-        self.buffer = bytearray(self.buffer_size)
         self.memory_map = None
         self.file_handle = None
         self.routing_table = {}
         self._fast_dest = None  # numpy-optimized destination indices
         self._fast_src = None   # numpy-optimized source indices (flattened)
-        self._buffer_view = None  # numpy view over self.buffer for vectorized writes
+        self._buffer_view = None  # numpy view directly over the memory map for vectorized writes
+        self._buffer_bytes = None  # flat uint8 view of the same memory map
+        self._fast_src_bytes = None   # per-byte source indices (3 per routed pixel)
+        self._fast_dest_bytes = None  # per-byte destination indices (3 per routed pixel)
+        self._dest_contig = None  # (start, end) byte range when destinations are gap-free
+        self._scratch = None    # preallocated N x 3 gather target for the fast path
+        self._corrected = None  # preallocated N x 3 color-corrected output
+        self._scratch_flat = None  # 1-D view of _scratch for the byte gather
+        self.profile = False    # Per-stage write timing (select/correct/assign), off on the hot path
         # Output color correction and channel order
         self.color_order = (color_order or "RGB").upper()
         self.gamma = float(gamma) if (gamma is not None) else None
         self.channel_gains = channel_gains if channel_gains else (1.0, 1.0, 1.0)
         # Precompute channel order indices
         self._channel_idx = self._make_channel_indices(self.color_order)
+        # Correction flags, resolved once instead of per frame/per pixel
+        self._identity_gains = tuple(self.channel_gains) == (1.0, 1.0, 1.0)
+        self._gamma_active = self.gamma is not None and abs(self.gamma - 1.0) > 1e-3
+        self._identity_order = self._channel_idx == (0, 1, 2)
+        # Per-channel 256-entry lookup tables (gains + gamma baked in), one
+        # contiguous array per source channel
+        self._lut_r = self._lut_g = self._lut_b = None
+        self._channel_plan = None
+        if HAS_NUMPY:
+            self._build_correction_luts()
+        # Same idea for the pure-Python writers: 256-entry int tables per output channel
+        self._level_tables = None
+        if not self._identity_gains or self._gamma_active:
+            self._level_tables = self._build_level_tables()
 
         # Derive the overlay model name from the mmap file path
         # e.g. "/dev/shm/FPP-Model-Data-Light_Wall" → "Light_Wall"
@@ -58,37 +79,62 @@ class FPPOutput:
         }
         return lookup.get(order, (0, 1, 2))
 
-    def _apply_correction_numpy(self, arr_uint8):
-        # arr_uint8: N x 3 uint8
-        if self.gamma is None and self.channel_gains == (1.0, 1.0, 1.0) and self._channel_idx == (0, 1, 2):
-            return arr_uint8
+    def _correct_levels_float(self, arr_uint8):
+        # arr_uint8: N x 3 uint8 in source channel order; returns corrected uint8
         arr = arr_uint8.astype(np.float32, copy=False)
-        if self.channel_gains != (1.0, 1.0, 1.0):
+        if not self._identity_gains:
             gains = np.array(self.channel_gains, dtype=np.float32)
             arr = arr * gains
-        if self.gamma is not None and abs(self.gamma - 1.0) > 1e-3:
+        if self._gamma_active:
             arr = np.power(np.clip(arr, 0, 255) / 255.0, self.gamma) * 255.0
         arr = np.clip(arr, 0, 255)
-        arr = arr.astype(np.uint8)
-        i0, i1, i2 = self._channel_idx
-        if (i0, i1, i2) != (0, 1, 2):
-            arr = arr[:, [i0, i1, i2]]
-        return arr
+        return arr.astype(np.uint8)
+
+    def _build_correction_luts(self):
+        """Evaluate gains/gamma once for every input level of every channel."""
+        levels = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+        lut = self._correct_levels_float(levels)
+        self._lut_r = np.ascontiguousarray(lut[:, 0])
+        self._lut_g = np.ascontiguousarray(lut[:, 1])
+        self._lut_b = np.ascontiguousarray(lut[:, 2])
+        # Channel order resolved once: output channel k reads source channel src
+        # through that channel's table
+        luts = (self._lut_r, self._lut_g, self._lut_b)
+        self._channel_plan = tuple((src, luts[src]) for src in self._channel_idx)
+
+    def _apply_correction_numpy(self, arr_uint8, out=None):
+        # arr_uint8: N x 3 uint8; result is written into out when provided
+        if not self._gamma_active and self._identity_gains and self._identity_order:
+            return arr_uint8
+        if out is None:
+            out = np.empty_like(arr_uint8)
+        for dst, (src, lut) in enumerate(self._channel_plan):
+            # 1-D contiguous table lookups; indices are uint8 so clip never triggers
+            np.take(lut, arr_uint8[:, src], out=out[:, dst], mode='clip')
+        return out
+
+    def _correct_level_tuple(self, value, channel):
+        # Float gains/gamma for one output channel, as the per-pixel writers used to do
+        level = value * self.channel_gains[channel]
+        if self._gamma_active:
+            level = (max(0.0, min(255.0, level)) / 255.0) ** self.gamma * 255.0
+        return int(max(0, min(255, round(level))))
+
+    def _build_level_tables(self):
+        """Evaluate the tuple-path correction once per level for each output channel."""
+        return tuple([self._correct_level_tuple(level, channel) for level in range(256)]
+                     for channel in range(3))
 
     def _apply_correction_tuple(self, r, g, b):
         # Lightweight path for non-numpy writers
-        if self._channel_idx != (0,1,2):
+        if not self._identity_order:
             order = [r, g, b]
             r, g, b = order[self._channel_idx[0]], order[self._channel_idx[1]], order[self._channel_idx[2]]
-        if self.channel_gains != (1.0, 1.0, 1.0) or (self.gamma is not None and abs(self.gamma - 1.0) > 1e-3):
-            rf = r * self.channel_gains[0]
-            gf = g * self.channel_gains[1]
-            bf = b * self.channel_gains[2]
-            if self.gamma is not None and abs(self.gamma - 1.0) > 1e-3:
-                rf = (max(0.0, min(255.0, rf)) / 255.0) ** self.gamma * 255.0
-                gf = (max(0.0, min(255.0, gf)) / 255.0) ** self.gamma * 255.0
-                bf = (max(0.0, min(255.0, bf)) / 255.0) ** self.gamma * 255.0
-            r, g, b = int(max(0, min(255, round(rf)))), int(max(0, min(255, round(gf)))), int(max(0, min(255, round(bf))))
+        if self._level_tables is not None:
+            # Clamp and int-cast before indexing, the float path accepted any level
+            r, g, b = (max(0, min(255, int(c))) for c in (r, g, b))
+            table_r, table_g, table_b = self._level_tables
+            r, g, b = table_r[r], table_g[g], table_b[b]
         return r, g, b
 
     def _initialize_memory_map(self, fpp_file):
@@ -112,6 +158,11 @@ class FPPOutput:
 
             self.file_handle = open(fpp_file, 'r+b')
             self.memory_map = mmap.mmap(self.file_handle.fileno(), self.buffer_size)
+            # The mapping is shared with FPP, so frames are written straight into it
+            # (no intermediate buffer, no seek/write/flush per frame)
+            if HAS_NUMPY:
+                self._buffer_bytes = np.frombuffer(self.memory_map, dtype=np.uint8)
+                self._buffer_view = self._buffer_bytes.reshape(-1, 3)
             print(f"[FPP_INIT] Memory map created successfully", flush=True)
             print(f"[FPP_INIT] ========================================", flush=True)
             # Enable overlay to always transmit (state 3)
@@ -213,12 +264,16 @@ class FPPOutput:
                     if 0 <= pixel_idx < 4500:
                         dest_indices.append(pixel_idx)
                         src_indices.append(visual_row * self.width + visual_col)
-                        self.routing_table[(visual_row, visual_col)] = [pixel_idx * 3]
+                        self.routing_table[(visual_row, visual_col)] = pixel_idx * 3
 
         if HAS_NUMPY and dest_indices:
             self._fast_dest = np.array(dest_indices, dtype=np.int32)
             self._fast_src = np.array(src_indices, dtype=np.int32)
-            self._buffer_view = np.frombuffer(self.buffer, dtype=np.uint8).reshape(-1, 3)
+            # Order pairs by destination so the per-frame scatter streams through
+            # the mmap linearly. Stable sort keeps last-write-wins for duplicates.
+            order = np.argsort(self._fast_dest, kind='stable')
+            self._fast_dest = self._fast_dest[order]
+            self._fast_src = self._fast_src[order]
             try:
                 print(f"FPPOutput mapping entries: {len(self._fast_dest)}")
             except Exception:
@@ -228,63 +283,100 @@ class FPPOutput:
             total = self.width * self.height
             self._fast_dest = np.arange(total, dtype=np.int32)
             self._fast_src = np.arange(total, dtype=np.int32)
-            self._buffer_view = np.frombuffer(self.buffer, dtype=np.uint8).reshape(-1, 3)
             try:
                 print("FPPOutput mapping empty; using linear fallback mapping")
             except Exception:
                 pass
 
+        if self._fast_src is not None:
+            # Per-frame gather/correct targets, reused so the hot path never allocates
+            self._scratch = np.empty((len(self._fast_src), 3), dtype=np.uint8)
+            self._corrected = np.empty_like(self._scratch)
+            self._scratch_flat = self._scratch.reshape(-1)
+            # Expand pixel indices to byte indices so gather/scatter run as flat
+            # 1-D byte copies instead of strided RGB-triplet indexing
+            self._fast_src_bytes = self._expand_to_byte_indices(self._fast_src)
+            self._fast_dest_bytes = self._expand_to_byte_indices(self._fast_dest)
+            # A gap-free ascending destination run (e.g. the linear fallback) can be
+            # stored as one slice copy; the stagger mapping keeps the byte scatter
+            if len(self._fast_dest) and np.all(np.diff(self._fast_dest) == 1):
+                start = int(self._fast_dest[0]) * 3
+                self._dest_contig = (start, start + len(self._fast_dest) * 3)
+
+        # Resolve the write path once instead of re-checking numpy/table state per frame
+        if self.memory_map and self._fast_dest is not None:
+            self.write = self._write_numpy_fast
+
+    @staticmethod
+    def _expand_to_byte_indices(pixel_indices):
+        byte_indices = np.empty(len(pixel_indices) * 3, dtype=np.intp)
+        base = pixel_indices.astype(np.intp) * 3
+        byte_indices[0::3] = base
+        byte_indices[1::3] = base + 1
+        byte_indices[2::3] = base + 2
+        return byte_indices
+
     def write(self, dot_colors):
-        """Write color data to FPP buffer and flush to memory map."""
+        """Write color data directly into the FPP memory map."""
         if not self.memory_map:
             import sys
             print(f"[FPP_WRITE] ERROR: No memory map, cannot write to FPP buffer", flush=True, file=sys.stderr)
             return 0.0
 
         start = time.perf_counter()
-        
-        # Track timing for different stages
-        select_start = time.perf_counter()
 
-        if HAS_NUMPY and isinstance(dot_colors, np.ndarray) and self._fast_dest is not None:
-            colors_flat = dot_colors.reshape(-1, 3)
-            selected = colors_flat[self._fast_src]
-            select_elapsed = time.perf_counter() - select_start
-            
-            correct_start = time.perf_counter()
-            corrected = self._apply_correction_numpy(selected)
-            correct_elapsed = time.perf_counter() - correct_start
-            
-            assign_start = time.perf_counter()
-            self._buffer_view[self._fast_dest] = corrected
-            assign_elapsed = time.perf_counter() - assign_start
-            
-            # Optional: verbose logging for each write (disabled by default to reduce overhead)
-            # print(f"[FPP_WRITE] select={select_elapsed*1000:.3f}ms correct={correct_elapsed*1000:.3f}ms assign={assign_elapsed*1000:.3f}ms", flush=True)
-        elif HAS_NUMPY and isinstance(dot_colors, np.ndarray):
-            for (row, col), byte_indices in self.routing_table.items():
+        if HAS_NUMPY and isinstance(dot_colors, np.ndarray):
+            for (row, col), byte_idx in self.routing_table.items():
                 pixel = dot_colors[row, col]
                 r, g, b = int(pixel[0]), int(pixel[1]), int(pixel[2])
                 r, g, b = self._apply_correction_tuple(r, g, b)
-                for byte_idx in byte_indices:
-                    self.buffer[byte_idx] = r
-                    self.buffer[byte_idx + 1] = g
-                    self.buffer[byte_idx + 2] = b
+                self.memory_map[byte_idx] = r
+                self.memory_map[byte_idx + 1] = g
+                self.memory_map[byte_idx + 2] = b
         else:
-            for (row, col), byte_indices in self.routing_table.items():
+            for (row, col), byte_idx in self.routing_table.items():
                 r, g, b = dot_colors[row][col]
                 r, g, b = self._apply_correction_tuple(r, g, b)
-                for byte_idx in byte_indices:
-                    self.buffer[byte_idx] = r
-                    self.buffer[byte_idx + 1] = g
-                    self.buffer[byte_idx + 2] = b
-
-        flush_start = time.perf_counter()
-        self.memory_map.seek(0)
-        self.memory_map.write(self.buffer)
-        self.memory_map.flush()  # Force sync to shared memory
-        flush_elapsed = time.perf_counter() - flush_start
-        
+                self.memory_map[byte_idx] = r
+                self.memory_map[byte_idx + 1] = g
+                self.memory_map[byte_idx + 2] = b
+
+        return self._finish_write(start)
+
+    def _write_numpy_fast(self, dot_colors):
+        """write() once the numpy routing indices and mmap view are ready."""
+        if not isinstance(dot_colors, np.ndarray):
+            # Nested-list frames (DotMatrix's initial buffer) take the generic path
+            return FPPOutput.write(self, dot_colors)
+
+        start = time.perf_counter()
+
+        # Gather straight into the preallocated buffer; the reshape is a free view
+        # for the contiguous frames DotMatrix hands over
+        colors_flat = dot_colors.reshape(-1)
+        np.take(colors_flat, self._fast_src_bytes, out=self._scratch_flat)
+        selected = self._scratch
+        if self.profile:
+            select_done = time.perf_counter()
+
+        corrected = self._apply_correction_numpy(selected, out=self._corrected)
+        if self.profile:
+            correct_done = time.perf_counter()
+
+        if self._dest_contig is not None:
+            start_byte, end_byte = self._dest_contig
+            self._buffer_bytes[start_byte:end_byte] = corrected.reshape(-1)
+        else:
+            self._buffer_bytes[self._fast_dest_bytes] = corrected.reshape(-1)
+        if self.profile:
+            assign_done = time.perf_counter()
+            print(f"[FPP_WRITE] select={(select_done - start)*1000:.3f}ms "
+                  f"correct={(correct_done - select_done)*1000:.3f}ms "
+                  f"assign={(assign_done - correct_done)*1000:.3f}ms", flush=True)
+
+        return self._finish_write(start)
+
+    def _finish_write(self, start):
         total_elapsed = time.perf_counter() - start
         
         # Debug: Log write activity periodically
@@ -293,8 +385,8 @@ class FPPOutput:
         self._write_count += 1
         if self._write_count <= 5 or self._write_count % 100 == 0:
             # Sample some pixel values to verify data is being written
-            sample = bytes(self.buffer[:12])  # First 4 pixels (12 bytes)
-            print(f"[FPP_WRITE] Frame #{self._write_count}: wrote {len(self.buffer)} bytes, first 12: {sample.hex()}", flush=True)
+            sample = self.memory_map[:12]  # First 4 pixels (12 bytes)
+            print(f"[FPP_WRITE] Frame #{self._write_count}: wrote {self.buffer_size} bytes, first 12: {sample.hex()}", flush=True)
         
         return total_elapsed * 1000
 
@@ -303,13 +395,15 @@ class FPPOutput:
         if not self.memory_map:
             return 0.0
         start = time.perf_counter()
-        rr, gg, bb = self._apply_correction_tuple(int(r), int(g), int(b))
-        for i in range(0, self.buffer_size, 3):
-            self.buffer[i] = rr
-            self.buffer[i + 1] = gg
-            self.buffer[i + 2] = bb
-        self.memory_map.seek(0)
-        self.memory_map.write(self.buffer)
+        r, g, b = (max(0, min(255, int(c))) for c in (r, g, b))
+        rr, gg, bb = self._apply_correction_tuple(r, g, b)
+        if self._buffer_view is not None:
+            # One strided store broadcasting the pattern across every pixel
+            self._buffer_view[:] = np.array((rr, gg, bb), dtype=np.uint8)
+            return (time.perf_counter() - start) * 1000
+        # Without numpy, repeat the 3-byte pattern and copy it in one slice store
+        pixel_count = self.buffer_size // 3
+        self.memory_map[:pixel_count * 3] = bytes((rr, gg, bb)) * pixel_count
         return (time.perf_counter() - start) * 1000
 
     def close(self):
@@ -317,6 +411,11 @@ class FPPOutput:
         self._cleanup()
 
     def _cleanup(self):
+        # Drop the numpy views first; mmap refuses to close while they are exported
+        self._buffer_view = None
+        self._buffer_bytes = None
+        # Fall back to the class write(), which reports the missing memory map
+        self.__dict__.pop('write', None)
         if self.memory_map:
             self.memory_map.close()
             self.memory_map = None
@@ -1,6 +1,18 @@
 """Performance monitoring utilities for DotMatrix rendering."""
 
 import time
+from array import array
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Samples kept per stage between reports (~4s of frames at 60 FPS); once full,
+# the oldest samples are overwritten
+TIMING_RING_CAPACITY = 256
+
 
 class PerformanceMonitor:
     """Tracks and reports rendering performance metrics."""
@@ -10,18 +22,26 @@ class PerformanceMonitor:
         self.target_fps = target_fps
         self.frame_count = 0
         self.last_log_time = time.time()
+        # Fixed-size ring buffer per stage plus a write count, so recording a
+        # sample never allocates
         self.stage_timings = {
-            'scaling': [],
-            'sampling_blend': [],
-            'visualization': [],
-            'fpp_write': [],
-            'total': []
+            stage: self._make_ring()
+            for stage in ('scaling', 'sampling_blend', 'visualization', 'fpp_write', 'ddp_write', 'total')
         }
+        self._stage_counts = {stage: 0 for stage in self.stage_timings}
+
+    @staticmethod
+    def _make_ring():
+        if HAS_NUMPY:
+            return np.zeros(TIMING_RING_CAPACITY, dtype=np.float32)
+        return array('f', bytes(4 * TIMING_RING_CAPACITY))
 
     def record(self, stage, duration_ms):
         """Record timing for a stage."""
         if self.enabled:
-            self.stage_timings[stage].append(duration_ms)
+            count = self._stage_counts[stage]
+            self.stage_timings[stage][count % TIMING_RING_CAPACITY] = duration_ms
+            self._stage_counts[stage] = count + 1
 
     def frame_complete(self):
         """Mark frame as complete and log if needed."""
@@ -37,6 +57,17 @@ class PerformanceMonitor:
             self._reset()
             self.last_log_time = current_time
 
+    def _samples(self, stage):
+        """Return the recorded samples for a stage (empty if none)."""
+        return self.stage_timings[stage][:min(self._stage_counts[stage], TIMING_RING_CAPACITY)]
+
+    @staticmethod
+    def _summarize(times):
+        """Return (avg, min, max) of a non-empty sample window."""
+        if HAS_NUMPY:
+            return float(times.mean()), float(times.min()), float(times.max())
+        return sum(times) / len(times), min(times), max(times)
+
     def _log_performance(self, elapsed):
         """Print performance report."""
         if self.frame_count == 0:
@@ -48,15 +79,15 @@ class PerformanceMonitor:
         print(f"Average FPS: {fps:.2f} | Frame Count: {self.frame_count}")
         print(f"\nStage Latencies (average):")
 
-        for stage, times in self.stage_timings.items():
-            if times:
-                avg = sum(times) / len(times)
-                min_t = min(times)
-                max_t = max(times)
+        for stage in self.stage_timings:
+            times = self._samples(stage)
+            if len(times):
+                avg, min_t, max_t = self._summarize(times)
                 print(f"  {stage:20s}: {avg:6.2f}ms (min: {min_t:5.2f}ms, max: {max_t:5.2f}ms)")
 
-        if self.stage_timings['total']:
-            avg_total = sum(self.stage_timings['total']) / len(self.stage_timings['total'])
+        totals = self._samples('total')
+        if len(totals):
+            avg_total = self._summarize(totals)[0]
             if self.target_fps:
                 frame_budget = 1000.0 / float(self.target_fps)
                 print(f"\nFrame budget: {frame_budget:5.2f}ms ({self.target_fps:.0f} FPS target)")
@@ -66,5 +97,5 @@ class PerformanceMonitor:
     def _reset(self):
         """Reset counters for next period."""
         self.frame_count = 0
-        for stage in self.stage_timings:
-            self.stage_timings[stage].clear()
+        for stage in self._stage_counts:
+            self._stage_counts[stage] = 0
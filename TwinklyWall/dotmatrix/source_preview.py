@@ -15,8 +15,12 @@ except ImportError:
 
 
 class SourcePreview:
-    def __init__(self, width, height, enabled=False, min_preview_color=(15, 15, 15)):
+    def __init__(self, width, height, enabled=False, min_preview_color=(15, 15, 15), inplace=False):
         self.enabled = bool(enabled and SDLWindow and SDLRenderer)
+        # When True, the min-brightness lift edits the caller's surface directly
+        # instead of a copy. Only safe if FPP/DDP sampling of that surface has
+        # already finished for the frame and the surface is redrawn before the next.
+        self.inplace = inplace
         self.window = None
         self.renderer = None
         self.texture = None
@@ -24,6 +28,8 @@ class SourcePreview:
         # Clamp to valid range and precompute numpy array for fast max
         self.min_preview_color = tuple(max(0, min(255, c)) for c in min_preview_color)
         self._min_preview_array = np.array(self.min_preview_color, dtype=np.uint8) if HAS_NUMPY else None
+        # With one shared threshold, "all channels below" is just "max channel below"
+        self._uniform_min = len(set(self.min_preview_color)) == 1
 
         if self.enabled:
             try:
@@ -41,13 +47,17 @@ class SourcePreview:
         if self.min_preview_color == (0, 0, 0):
             return surface
 
-        # Copy so we never mutate the source surface used for FPP output
-        clamped = surface.copy()
+        # Copy so we never mutate the source surface used for FPP output,
+        # unless the caller opted in to in-place edits
+        clamped = surface if self.inplace else surface.copy()
 
         if HAS_NUMPY:
             pixels = pygame.surfarray.pixels3d(clamped)
             thr = self._min_preview_array
-            mask = (pixels[:, :, 0] < thr[0]) & (pixels[:, :, 1] < thr[1]) & (pixels[:, :, 2] < thr[2])
+            if self._uniform_min:
+                mask = pixels.max(axis=2) < thr[0]
+            else:
+                mask = (pixels[:, :, 0] < thr[0]) & (pixels[:, :, 1] < thr[1]) & (pixels[:, :, 2] < thr[2])
             pixels[mask] = thr
             del pixels  # release view
             return clamped
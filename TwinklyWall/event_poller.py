@@ -1,28 +1,33 @@
 """
 High-frequency event polling system for Pygame to prevent input drops.
 
-This module runs event polling in a dedicated thread at maximum speed,
-ensuring the pygame event queue never overflows and all inputs are captured.
-Events are stored in a thread-safe queue for the main game loop to consume.
+This module runs event polling in a dedicated thread that wakes as soon as
+SDL has input, ensuring the pygame event queue never overflows and all inputs
+are captured.
+Events are stored in a lock-free deque for the main game loop to consume.
 """
 
 import pygame
 import threading
-import queue
 import time
+from collections import deque
 from logger import log
 
+POLL_WAIT_TIMEOUT_MS = 10  # Max time blocked in pygame.event.wait before re-checking stop
+
 
 class EventPoller:
     """
     Thread-based event poller that continuously drains pygame's event queue.
     
     Prevents event drops by polling at maximum frequency and storing events
-    in an unlimited thread-safe queue for later processing.
+    in an unlimited deque for later processing. There is exactly one producer
+    (the poll thread) and one consumer (the game loop), and deque.append /
+    popleft are atomic in CPython, so no locking is needed.
     """
     
     def __init__(self):
-        self.event_queue = queue.Queue()  # Thread-safe, unlimited queue
+        self.event_queue = deque()  # Single-producer/single-consumer, unlimited
         self.running = False
         self.thread = None
         self._stop_event = threading.Event()
@@ -54,32 +59,36 @@ class EventPoller:
         
     def _poll_loop(self):
         """
-        Main polling loop - runs at maximum speed to prevent queue overflow.
+        Main polling loop - blocks in SDL until input arrives, then drains the queue.
         
         This runs in a separate thread and continuously drains pygame's event queue,
-        storing all events in our unlimited thread-safe queue.
+        storing all events in our unlimited deque. The wait timeout bounds how long
+        stop() takes to be noticed while idle.
         """
         while self.running and not self._stop_event.is_set():
             try:
-                # Get ALL pending events in one batch
-                events = pygame.event.get()
+                # Sleep in SDL until an event arrives (no wakeups while idle)
+                event = pygame.event.wait(POLL_WAIT_TIMEOUT_MS)
+                if event.type == pygame.NOEVENT:
+                    continue
+
+                # Then take everything else already pending in one batch
+                events = [event]
+                events.extend(pygame.event.get())
                 
                 if events:
-                    for event in events:
-                        self.event_queue.put(event)
-                        self.events_polled += 1
+                    # deque.extend hands over the whole batch in one atomic call
+                    self.event_queue.extend(events)
+                    self.events_polled += len(events)
                     
                     # Periodic logging of polling stats
                     current_time = time.time()
                     if current_time - self.last_log_time >= 10.0:
-                        queue_size = self.event_queue.qsize()
+                        queue_size = len(self.event_queue)
                         log(f"📊 Event poller stats | Polled: {self.events_polled} | Queue size: {queue_size}", 
                             module="EventPoller")
                         self.last_log_time = current_time
                 
-                # Yield CPU briefly to prevent 100% usage, but keep polling very fast
-                time.sleep(0.0001)  # 0.1ms - poll at ~10,000 Hz
-                
             except Exception as e:
                 log(f"Error in event polling loop: {e}", level='ERROR', module="EventPoller")
                 time.sleep(0.001)  # Back off on error
@@ -92,17 +101,19 @@ class EventPoller:
             list: All events currently in the queue (may be empty)
         """
         events = []
-        while not self.event_queue.empty():
+        popleft = self.event_queue.popleft
+        # popleft until empty so events appended mid-drain are never lost
+        while True:
             try:
-                events.append(self.event_queue.get_nowait())
-            except queue.Empty:
+                events.append(popleft())
+            except IndexError:
                 break
         return events
     
     def has_events(self):
         """Check if there are any pending events."""
-        return not self.event_queue.empty()
+        return bool(self.event_queue)
     
     def queue_size(self):
         """Get the current number of pending events."""
-        return self.event_queue.qsize()
+        return len(self.event_queue)
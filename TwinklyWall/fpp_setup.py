@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.request import urlopen
 
+# Keeps "$ cmd" lines whole when renders run from several threads
+_print_lock = threading.Lock()
+
 
 def run(cmd, cwd=None, check=True, capture=False, sudo=False):
     if sudo and os.geteuid() != 0:
         cmd = ["sudo"] + cmd
-    print("$", " ".join(cmd))
+    with _print_lock:
+        print("$", " ".join(cmd), flush=True)
     return subprocess.run(
         cmd,
         cwd=cwd,
@@ -29,9 +37,11 @@ def ensure_git_sync(repo_dir: Path, remote: str = "origin", branch: str = "maste
     except subprocess.CalledProcessError:
         print(f"Warning: {repo_dir} is not a git repo; skipping pull")
         return
-    run(["git", "fetch", "--all", "--prune"], cwd=repo_dir)
-    # Fast-forward only to avoid merge prompts while script runs
-    run(["git", "pull", "--ff-only", remote, branch], cwd=repo_dir, check=False)
+    # One fetch of the branch we track
+    run(["git", "fetch", "--prune", remote, branch], cwd=repo_dir)
+    # Fast-forward to what was just fetched instead of a pull that would fetch again;
+    # ff-only avoids merge prompts and never discards local commits
+    run(["git", "merge", "--ff-only", f"{remote}/{branch}"], cwd=repo_dir, check=False)
 
 
 def ensure_venv(tw_dir: Path, python_bin: str = sys.executable):
@@ -48,46 +58,46 @@ def ensure_venv(tw_dir: Path, python_bin: str = sys.executable):
     return venv_dir
 
 
-def install_service(tw_dir: Path, service_name: str = "twinklywall"):
-    unit_src = tw_dir / "twinklywall.service"
-    unit_dst = Path("/etc/systemd/system") / f"{service_name}.service"
-    if not unit_src.exists():
-        raise FileNotFoundError(f"Missing service file: {unit_src}")
-    # Copy unit and reload systemd
-    run(["cp", str(unit_src), str(unit_dst)], sudo=True)
-    run(["systemctl", "daemon-reload"], sudo=True)
-    run(["systemctl", "enable", service_name], sudo=True, check=False)
-
+def install_services(units):
+    """Install systemd units given as (unit_src, service_name) pairs and enable them.
 
-def install_ddp_bridge_service(tw_dir: Path, service_name: str = "ddp_bridge"):
-    unit_src = tw_dir / "ddp_bridge.service"
-    unit_dst = Path("/etc/systemd/system") / f"{service_name}.service"
-    if not unit_src.exists():
-        raise FileNotFoundError(f"Missing service file: {unit_src}")
-    run(["cp", str(unit_src), str(unit_dst)], sudo=True)
-    run(["systemctl", "daemon-reload"], sudo=True)
-    run(["systemctl", "enable", service_name], sudo=True, check=False)
+    All copies and the daemon-reload run in one privileged shell, and every service is
+    enabled by a single systemctl call.
+    """
+    commands = []
+    for unit_src, service_name in units:
+        unit_dst = Path("/etc/systemd/system") / f"{service_name}.service"
+        if not unit_src.exists():
+            raise FileNotFoundError(f"Missing service file: {unit_src}")
+        commands.append(f"cp {shlex.quote(str(unit_src))} {shlex.quote(str(unit_dst))}")
+    # Copy units and reload systemd
+    commands.append("systemctl daemon-reload")
+    run(["sh", "-c", " && ".join(commands)], sudo=True)
+    run(["systemctl", "enable"] + [service_name for _, service_name in units], sudo=True, check=False)
 
 
-def restart_service(service_name: str = "twinklywall"):
-    run(["systemctl", "restart", service_name], sudo=True)
-    # Small delay for Flask to bind
-    time.sleep(2)
+def restart_services(service_names):
+    # One systemctl call for all units; no fixed delay for Flask to bind, wait_for_health polls instead
+    run(["systemctl", "restart"] + list(service_names), sudo=True)
 
 
 def wait_for_health(timeout_sec: int = 20, url: str = "http://localhost:5000/api/health"):
-    start = time.time()
+    start = time.monotonic()
     last_err = None
-    while time.time() - start < timeout_sec:
+    # Probe right away and back off gradually, so a service that is already up answers in milliseconds
+    delay = 0.05
+    while time.monotonic() - start < timeout_sec:
         try:
-            with urlopen(url, timeout=2) as r:
-                body = r.read().decode("utf-8", errors="ignore")
-                if "ok" in body:
+            with urlopen(url, timeout=0.5) as r:
+                # The health payload is tiny ({"status": "ok"}); don't read past it
+                body = r.read(64).decode("utf-8", errors="ignore")
+                if r.status == 200 and "ok" in body:
                     print("Health check OK:", body)
                     return True
         except Exception as e:
             last_err = e
-        time.sleep(1)
+        time.sleep(max(0.0, min(delay, timeout_sec - (time.monotonic() - start))))
+        delay = min(delay * 1.5, 1.0)
     if last_err:
         print("Health check failed:", last_err)
     return False
@@ -98,7 +108,49 @@ def has_rendered_videos(tw_dir: Path) -> bool:
     return len(rendered) > 0
 
 
-def render_all_sources(tw_dir: Path, venv_dir: Path, width: int = 90, height: int = 50, fps: int = 20):
+RENDER_INDEX_NAME = ".render_index.json"
+
+
+def render_output_dirs(tw_dir: Path):
+    # Where existing renders live, and video_renderer.py's default output directory
+    return (tw_dir / "dotmatrix" / "rendered_videos", tw_dir.parent / "media" / "rendered")
+
+
+def render_output_name(video: Path, width: int, height: int, fps: int) -> str:
+    # Mirrors VideoRenderer.render_video's auto-generated name
+    return f"{video.stem}_{width}x{height}_{fps:.0f}fps.npz"
+
+
+def load_render_index(index_path: Path) -> dict:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_render_index(index_path: Path, index: dict):
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+
+def default_render_jobs() -> int:
+    # Each render is a full decode/scale process next to the running service, so stay at two on bigger hosts
+    return min(2, os.cpu_count() or 1)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def render_all_sources(tw_dir: Path, venv_dir: Path, width: int = 90, height: int = 50, fps: int = 20, jobs: int = None):
     src_dir = tw_dir / "assets" / "source_videos"
     if not src_dir.exists():
         print(f"No source_videos directory at {src_dir}; skipping render")
@@ -107,10 +159,52 @@ def render_all_sources(tw_dir: Path, venv_dir: Path, width: int = 90, height: in
     if not videos:
         print("No source videos found; skipping render")
         return
-    py = venv_dir / "bin" / "python"
+
+    # Skip videos whose source is unchanged since the last successful render and whose output still exists
+    index_path = tw_dir / "dotmatrix" / "rendered_videos" / RENDER_INDEX_NAME
+    old_index = load_render_index(index_path)
+    index = {}
+    pending = []
     for p in videos:
-        print(f"Rendering: {p.name}")
-        run([str(py), "video_renderer.py", str(p), str(fps), str(width), str(height)], cwd=tw_dir)
+        stat = p.stat()
+        entry = {"mtime": stat.st_mtime, "size": stat.st_size, "output_name": render_output_name(p, width, height, fps)}
+        output_present = any((d / entry["output_name"]).exists() for d in render_output_dirs(tw_dir))
+        if old_index.get(p.name) == entry and output_present:
+            index[p.name] = entry
+        else:
+            pending.append((p, entry))
+    if not pending:
+        print("All source videos are already rendered; skipping render")
+        save_render_index(index_path, index)
+        return
+
+    py = venv_dir / "bin" / "python"
+
+    def render(p):
+        # Capture each renderer's output and print it as one block so parallel renders don't interleave
+        result = run([str(py), "video_renderer.py", str(p), str(fps), str(width), str(height)],
+                     cwd=tw_dir, check=False, capture=True)
+        with _print_lock:
+            print(f"Rendering: {p.name}")
+            print(result.stdout or "", end="", flush=True)
+        result.check_returncode()
+
+    # Each render is an independent subprocess, so run several at once
+    workers = min(len(pending), jobs or default_render_jobs())
+    first_error = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(pool.submit(render, p), p, entry) for p, entry in pending]
+        for future, p, entry in futures:
+            try:
+                future.result()
+                index[p.name] = entry
+            except subprocess.CalledProcessError as e:
+                first_error = first_error or e
+
+    # Record what succeeded, then fail like the serial loop did
+    save_render_index(index_path, index)
+    if first_error:
+        raise first_error
 
 
 def main():
@@ -119,6 +213,7 @@ def main():
     parser.add_argument("--service", default="twinklywall", help="systemd service name")
     parser.add_argument("--render-all", action="store_true", help="Render all assets if none are rendered")
     parser.add_argument("--skip-pull", action="store_true", help="Skip git pull step")
+    parser.add_argument("--jobs", type=positive_int, default=default_render_jobs(), help="Number of videos to render in parallel")
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[1]  # TwinklyWall_Project
@@ -133,17 +228,14 @@ def main():
     print("\n== Ensuring Python venv and dependencies ==")
     venv_dir = ensure_venv(tw_dir)
 
-    print("\n== Installing/Updating systemd service ==")
-    install_service(tw_dir, service_name=args.service)
-
-    print("\n== Installing/Updating DDP bridge service ==")
-    install_ddp_bridge_service(tw_dir, service_name="ddp_bridge")
-
-    print("\n== Restarting service ==")
-    restart_service(service_name=args.service)
+    print("\n== Installing/Updating systemd and DDP bridge services ==")
+    install_services([
+        (tw_dir / "twinklywall.service", args.service),
+        (tw_dir / "ddp_bridge.service", "ddp_bridge"),
+    ])
 
-    print("\n== Restarting DDP bridge service ==")
-    restart_service(service_name="ddp_bridge")
+    print("\n== Restarting services ==")
+    restart_services([args.service, "ddp_bridge"])
 
     print("\n== Waiting for API health ==")
     ok = wait_for_health()
@@ -153,7 +245,7 @@ def main():
 
     if args.render_all and not has_rendered_videos(tw_dir):
         print("\n== Rendering all source videos (none detected) ==")
-        render_all_sources(tw_dir, venv_dir)
+        render_all_sources(tw_dir, venv_dir, jobs=args.jobs)
         print("Render step complete.")
     else:
         print("\nRendered videos present or render step skipped.")
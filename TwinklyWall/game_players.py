@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import heapq
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from players import Player, register_player, set_input_handler, get_registry, InputPayload
 from logger import log
@@ -21,8 +22,14 @@ class GamePlayerManager:
     """Tracks active players per game, enforces limits, and detects disconnects."""
 
     def __init__(self):
-        self._active_by_game: Dict[str, List[str]] = {}  # game -> [player_id, ...]
-        self._last_heartbeat: Dict[str, float] = {}  # player_id -> timestamp
+        self._active_by_game: Dict[str, Dict[str, None]] = {}  # game -> {player_id: None} (insertion-ordered set)
+        self._last_heartbeat: Dict[str, float] = {}  # player_id -> time.monotonic() of last heartbeat
+        # (timestamp, player_id) per heartbeat, oldest first. Entries whose timestamp no longer
+        # matches _last_heartbeat are stale and skipped when popped.
+        self._heartbeat_heap: List[Tuple[float, str]] = []
+        # game -> ((roster version, registry version), [Player, ...]) so repeat lookups skip the rebuild
+        self._active_players_cache: Dict[str, Tuple[Tuple[int, int], List[Player]]] = {}
+        self._roster_version = 0  # Bumped on join/leave
         self._player_metadata: Dict[str, dict] = {}  # player_id -> {game, joined_at, ...}
 
     def can_join(self, game: str) -> bool:
@@ -30,7 +37,7 @@ class GamePlayerManager:
         limit = GAME_LIMITS.get(game)
         if limit is None:
             return True  # No limit
-        current_count = len(self._active_by_game.get(game, []))
+        current_count = len(self._active_by_game.get(game, ()))
         return current_count < limit
 
     def join(self, player_id: str, phone_id: Optional[str] = None, game: str = "tetris", gamemode_selection: int = 0) -> bool:
@@ -45,13 +52,14 @@ class GamePlayerManager:
         # Register with the shared registry
         register_player(player_id, phone_id=phone_id, game=game)
 
-        # Track in our game-specific manager
-        if game not in self._active_by_game:
-            self._active_by_game[game] = []
-        if player_id not in self._active_by_game[game]:
-            self._active_by_game[game].append(player_id)
+        # Track in our game-specific manager; a player switching games leaves the old one
+        previous_game = self._player_metadata.get(player_id, {}).get("game")
+        if previous_game is not None and previous_game != game:
+            self._active_by_game.get(previous_game, {}).pop(player_id, None)
+        self._active_by_game.setdefault(game, {})[player_id] = None
+        self._roster_version += 1
 
-        self._last_heartbeat[player_id] = time.time()
+        self._record_heartbeat(player_id)
         self._player_metadata[player_id] = {
             "game": game,
             "joined_at": time.time(),
@@ -67,40 +75,76 @@ class GamePlayerManager:
         registry = get_registry()
         registry.unregister(player_id)
 
-        # Remove from all games
-        for game_list in self._active_by_game.values():
-            if player_id in game_list:
-                game_list.remove(player_id)
+        # Remove from the game recorded at join; scan every game only if metadata is missing
+        game = self._player_metadata.get(player_id, {}).get("game")
+        if game in self._active_by_game:
+            self._active_by_game[game].pop(player_id, None)
+        else:
+            for game_players in self._active_by_game.values():
+                game_players.pop(player_id, None)
 
         self._last_heartbeat.pop(player_id, None)
         self._player_metadata.pop(player_id, None)
+        self._roster_version += 1
 
     def heartbeat(self, player_id: str) -> None:
         """Update the last-seen timestamp for a player (called on any input/ping)."""
-        self._last_heartbeat[player_id] = time.time()
+        self._record_heartbeat(player_id)
+
+    def _record_heartbeat(self, player_id: str) -> None:
+        # Monotonic so wall-clock jumps (NTP) can't time players out early or keep them forever
+        now = time.monotonic()
+        self._last_heartbeat[player_id] = now
+        heapq.heappush(self._heartbeat_heap, (now, player_id))
 
     def get_idle_players(self, timeout_sec: float = PLAYER_TIMEOUT_SEC) -> List[str]:
         """Return player IDs that have not sent a heartbeat in timeout_sec."""
-        now = time.time()
+        now = time.monotonic()
         idle = []
         for player_id, last_ts in self._last_heartbeat.items():
             if (now - last_ts) > timeout_sec:
                 idle.append(player_id)
         return idle
 
+    def _pop_idle_players(self, timeout_sec: float) -> List[str]:
+        # Only entries older than the cutoff are touched, so cost tracks expirations, not player count
+        cutoff = time.monotonic() - timeout_sec
+        heap = self._heartbeat_heap
+        idle = []
+        while heap and heap[0][0] < cutoff:
+            last_ts, player_id = heapq.heappop(heap)
+            if self._last_heartbeat.get(player_id) == last_ts:
+                # Dropped right away, so a duplicate entry with the same timestamp can't match again
+                del self._last_heartbeat[player_id]
+                idle.append(player_id)
+        return idle
+
     def cleanup_idle(self, timeout_sec: float = PLAYER_TIMEOUT_SEC) -> None:
         """Remove all idle players."""
-        for player_id in self.get_idle_players(timeout_sec):
+        for player_id in self._pop_idle_players(timeout_sec):
             game = self._player_metadata.get(player_id, {}).get("game", "unknown")
             phone_id = self._player_metadata.get(player_id, {}).get("phone_id", player_id)
             log(f"⏱️  TIMEOUT - Removing idle player: {phone_id} from {game} (no heartbeat for {timeout_sec}s)", module="GamePlayers")
             self.leave(player_id)
 
     def get_active_players_for_game(self, game: str) -> List[Player]:
-        """Return list of Player objects currently in this game."""
-        player_ids = self._active_by_game.get(game, [])
+        """Return list of Player objects currently in this game.
+
+        The list is cached until a player joins/leaves or the registry changes; treat it as read-only.
+        """
         registry = get_registry()
-        return [registry._players[pid] for pid in player_ids if pid in registry._players]
+        version = (self._roster_version, registry.version)
+        cached = self._active_players_cache.get(game)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        players = []
+        for pid in self._active_by_game.get(game, ()):
+            player = registry.get_player(pid)
+            if player is not None:
+                players.append(player)
+        self._active_players_cache[game] = (version, players)
+        return players
 
     def get_game_for_player(self, player_id: str) -> Optional[str]:
         """Return the game a player is currently in, or None."""
@@ -112,7 +156,7 @@ class GamePlayerManager:
 
     def player_count_for_game(self, game: str) -> int:
         """Get current player count for a game."""
-        return len(self._active_by_game.get(game, []))
+        return len(self._active_by_game.get(game, ()))
 
 
 # Module-level singleton
@@ -172,8 +216,7 @@ def get_player_data(player_id: str) -> Optional[dict]:
     Get game state data for a player (score, level, lines, etc.).
     Returns the game_state dict stored on the player, or None if player not found.
     """
-    registry = get_registry()
-    player = registry._players.get(player_id)
+    player = get_registry().get_player(player_id)
     if player:
         return player.game_state
     return None
@@ -184,8 +227,7 @@ def set_player_score_data(player_id: str, score: int, level: int = 1, lines: int
     Update a player's game score data.
     This should be called from the game (e.g., Tetris) whenever score changes.
     """
-    registry = get_registry()
-    player = registry._players.get(player_id)
+    player = get_registry().get_player(player_id)
     if player:
         player.game_state['score'] = score
         player.game_state['level'] = level
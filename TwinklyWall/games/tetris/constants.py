@@ -4,6 +4,7 @@ TETROMINO_MAX_GRID_SIZE = 4
 
 ### Game Settings ###
 LINE_FADE_TIME_SECONDS = 0.5
+NANOSECONDS_PER_SECOND = 1_000_000_000 # The drop timer counts whole nanoseconds so it never drifts
 
 # Classic #
 CLASSIC_START_LEVEL_INDEX = 0
@@ -11,6 +12,10 @@ CLASSIC_NEXT_LEVEL_BASE_GOAL = 10
 CLASSIC_FIRST_LEVEL_GOAL_FLOOR = 100
 CLASSIC_FIRST_LEVEL_GOAL_FLOOR_HALF = CLASSIC_FIRST_LEVEL_GOAL_FLOOR / 2.0
 CLASSIC_NES_FPS = 60.0988
+CLASSIC_FRAMES_PER_DROP = (48, 43, 38, 33, 28, 23, 18, 13, 8, 6, # Index: level, values match NES Marathon mode
+                           5, 5, 5, 4, 4, 4, 3, 3, 3,
+                           2, 2, 2, 2, 2, 2, 2, 2, 2, 2,
+                           1) # Last entry holds for every level above it
 CLASSIC_LINES_CLEARED_SCORE_REWARD = [0,40,100,300,1200] # Index: num lines cleared at once
 CLASSIC_POINTS_PER_SOFT_DROP_STEP = 1
 CLASSIC_SOFT_DROP_SPEED_DIVISOR = 2
@@ -31,6 +36,9 @@ MODERN_RANDOM_BAG_SIZE = 7
 GRID_WIDTH = 10
 GRID_HEIGHT = 25
 GRID_PIXEL_SIZE = 3
+GRID_WALL_PADDING = TETROMINO_MAX_GRID_SIZE # Solid cells around the grid, wide enough that any move or kick tested from a valid position stays on the board
+GRID_WALL_VALUE = 255 # Any non-zero value reads as occupied
+GRID_WALLED_WIDTH = GRID_WIDTH + 2 * GRID_WALL_PADDING # Also the bit stride of one row in the packed collision board
 BORDER_THICKNESS = 2
 
 ### Style ###
@@ -46,168 +54,58 @@ GAME_OVER_FILENAME = 'game_over_screen.png'
 ### Tetromino Definition ###
 TETROMINO_COLORS = [(0,0,0), (0, 230, 254),(254, 16, 60),(184, 2, 253),(24, 1, 255),(255, 222, 0),(102, 253, 0),(255, 115, 8)]
 
-# TODO : This is terrible. Refactor to Enum with named groups
-    # Use Rotation enum
-    # Use Enum for Piece Group
-KICK_OFFSETS = [
-        ### Piece_group 0: I piece
-        [
-        # Counter-clockwise
-            [
-                # Desired rotation
-                [
-                    #Try number
-                    (-1,0),
-                    (2,0),
-                    (-1,2),
-                    (2,-1),
-                ],
-                [
-                    (2,0),
-                    (-1,0),
-                    (2,1),
-                    (-1,-2),
-                ],
-                [
-                    (1,0),
-                    (-2,0),
-                    (1,-2),
-                    (-2,1),
-                ],
-                [
-                    (-2,0),
-                    (1,0),
-                    (-2,-1),
-                    (1,2),
-                ],
-            ],
-            # Clockwise
-            [
-                # Desired rotation
-                [
-                    #Try number
-                    (-2,0),
-                    (1,0),
-                    (-2,-1),
-                    (1,2),
-                ],
-                [
-                    (-1,0),
-                    (2,0),
-                    (-1,2),
-                    (2,-1),
-                ],
-                [
-                    (2,0),
-                    (-1,0),
-                    (2,1),
-                    (-1,-2),
-                ],
-                [
-                    (1,0),
-                    (-2,0),
-                    (1,-2),
-                    (-2,1),
-                ],
-            ],
-        ],
-        ### Piece_group 1
-        [
-            
-        # Counter-clockwise
-            [
-                # Desired rotation
-                [
-                    #Try number
-                    (1,0),
-                    (1,1),
-                    (0,-2),
-                    (1,-2),
-                ],
-                [
-                    (1,0),
-                    (1,-1),
-                    (0,2),
-                    (1,2),
-                ],
-                [
-                    (-1,0),
-                    (-1,1),
-                    (0,-2),
-                    (-1,-2),
-                ],
-                [
-                    (-1,0),
-                    (-1,-1),
-                    (0,2),
-                    (-1,2),
-                ],
-            ],
-            # Clockwise
-            [
-                # Desired rotation
-                [
-                    #Try number
-                    (-1,0),
-                    (-1,1),
-                    (0,-2),
-                    (-1,-2),
-                ],
-                [
-                    (1,0),
-                    (1,-1),
-                    (0,2),
-                    (1,2),
-                ],
-                [
-                    (1,0),
-                    (1,1),
-                    (0,-2),
-                    (1,-2),
-                ],
-                [
-                    (-1,0),
-                    (-1,-1),
-                    (0,2),
-                    (-1,2),
-                ],
-            ],
-        ],
-    ]
+# SRS wall kicks, tried in order until one fits; the first test is the plain rotation.
+# Indexed [from_rotation][to_rotation] with rotation counting clockwise quarter turns (None for half turns).
+# Offsets are (x, y) with +y up, matching the grid and the SRS tables as usually written.
+KICK_OFFSETS_JLSTZ = (
+    (None, ((0,0), (-1,0), (-1,1), (0,-2), (-1,-2)), None, ((0,0), (1,0), (1,1), (0,-2), (1,-2))), # From 0
+    (((0,0), (1,0), (1,-1), (0,2), (1,2)), None, ((0,0), (1,0), (1,-1), (0,2), (1,2)), None), # From R
+    (None, ((0,0), (-1,0), (-1,1), (0,-2), (-1,-2)), None, ((0,0), (1,0), (1,1), (0,-2), (1,-2))), # From 2
+    (((0,0), (-1,0), (-1,-1), (0,2), (-1,2)), None, ((0,0), (-1,0), (-1,-1), (0,2), (-1,2)), None), # From L
+)
+# The I piece's base shape sits in the third row of its box, which is the SRS "2" state, so its SRS table
+# is written here shifted by two rotations: rotation 0 uses the SRS 2 rows, rotation 1 the L rows, and so on.
+KICK_OFFSETS_I = (
+    (None, ((0,0), (2,0), (-1,0), (2,1), (-1,-2)), None, ((0,0), (1,0), (-2,0), (1,-2), (-2,1))), # From 0 (SRS 2)
+    (((0,0), (-2,0), (1,0), (-2,-1), (1,2)), None, ((0,0), (1,0), (-2,0), (1,-2), (-2,1)), None), # From R (SRS L)
+    (None, ((0,0), (-1,0), (2,0), (-1,2), (2,-1)), None, ((0,0), (-2,0), (1,0), (-2,-1), (1,2))), # From 2 (SRS 0)
+    (((0,0), (-1,0), (2,0), (-1,2), (2,-1)), None, ((0,0), (2,0), (-1,0), (2,1), (-1,-2)), None), # From L (SRS R)
+)
 
 
 
 EMPTY = False
 FILLED = True
-TETROMINO_I_GRID_SHAPE = [[EMPTY,EMPTY,EMPTY,EMPTY],
-                          [EMPTY,EMPTY,EMPTY,EMPTY],
-                          [FILLED,FILLED,FILLED,FILLED],
-                          [EMPTY,EMPTY,EMPTY,EMPTY]]
+# Shapes are tuples of tuples so the table can be shared by every piece without risk of mutation
+TETROMINO_I_GRID_SHAPE = ((EMPTY,EMPTY,EMPTY,EMPTY),
+                          (EMPTY,EMPTY,EMPTY,EMPTY),
+                          (FILLED,FILLED,FILLED,FILLED),
+                          (EMPTY,EMPTY,EMPTY,EMPTY))
 
-TETROMINO_J_GRID_SHAPE = [[FILLED,EMPTY,EMPTY],
-                          [FILLED,FILLED,FILLED],
-                          [EMPTY,EMPTY,EMPTY]]
+TETROMINO_J_GRID_SHAPE = ((FILLED,EMPTY,EMPTY),
+                          (FILLED,FILLED,FILLED),
+                          (EMPTY,EMPTY,EMPTY))
 
-TETROMINO_L_GRID_SHAPE = [[EMPTY,EMPTY,FILLED],
-                          [FILLED,FILLED,FILLED],
-                          [EMPTY,EMPTY,EMPTY]],
+TETROMINO_L_GRID_SHAPE = ((EMPTY,EMPTY,FILLED),
+                          (FILLED,FILLED,FILLED),
+                          (EMPTY,EMPTY,EMPTY))
 
-TETROMINO_O_GRID_SHAPE = [[EMPTY,EMPTY,EMPTY,EMPTY],
-                          [EMPTY,FILLED,FILLED,EMPTY],
-                          [EMPTY,FILLED,FILLED,EMPTY],
-                          [EMPTY,EMPTY,EMPTY,EMPTY]]
+TETROMINO_O_GRID_SHAPE = ((EMPTY,EMPTY,EMPTY,EMPTY),
+                          (EMPTY,FILLED,FILLED,EMPTY),
+                          (EMPTY,FILLED,FILLED,EMPTY),
+                          (EMPTY,EMPTY,EMPTY,EMPTY))
 
-TETROMINO_S_GRID_SHAPE = [[EMPTY,FILLED,FILLED],
-                          [FILLED,FILLED,EMPTY],
-                          [EMPTY,EMPTY,EMPTY]]
+TETROMINO_S_GRID_SHAPE = ((EMPTY,FILLED,FILLED),
+                          (FILLED,FILLED,EMPTY),
+                          (EMPTY,EMPTY,EMPTY))
 
-TETROMINO_Z_GRID_SHAPE = [[FILLED,FILLED,EMPTY],
-                          [EMPTY,FILLED,FILLED],
-                          [EMPTY,EMPTY,EMPTY]],
+TETROMINO_Z_GRID_SHAPE = ((FILLED,FILLED,EMPTY),
+                          (EMPTY,FILLED,FILLED),
+                          (EMPTY,EMPTY,EMPTY))
 
-TETROMINO_T_GRID_SHAPE = [[EMPTY,FILLED,EMPTY],
-                          [FILLED,FILLED,FILLED],
-                          [EMPTY,EMPTY,EMPTY]]
+TETROMINO_T_GRID_SHAPE = ((EMPTY,FILLED,EMPTY),
+                          (FILLED,FILLED,FILLED),
+                          (EMPTY,EMPTY,EMPTY))
 
 TETROMINO_I_GRID_SIZE = 4
 
@@ -221,4 +119,10 @@ TETROMINO_S_GRID_SIZE = 3
 
 TETROMINO_Z_GRID_SIZE = 3
 
-TETROMINO_T_GRID_SIZE = 3
\ No newline at end of file
+TETROMINO_T_GRID_SIZE = 3
+
+# Indexed by TetrominoType value, like TETROMINO_COLORS (index 0 is no piece)
+TETROMINO_GRID_SHAPES = (None, TETROMINO_I_GRID_SHAPE, TETROMINO_J_GRID_SHAPE, TETROMINO_L_GRID_SHAPE, TETROMINO_O_GRID_SHAPE,
+                         TETROMINO_S_GRID_SHAPE, TETROMINO_Z_GRID_SHAPE, TETROMINO_T_GRID_SHAPE)
+TETROMINO_GRID_SIZES = (0, TETROMINO_I_GRID_SIZE, TETROMINO_J_GRID_SIZE, TETROMINO_L_GRID_SIZE, TETROMINO_O_GRID_SIZE,
+                        TETROMINO_S_GRID_SIZE, TETROMINO_Z_GRID_SIZE, TETROMINO_T_GRID_SIZE)
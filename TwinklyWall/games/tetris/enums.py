@@ -1,11 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum, IntEnum
-from .constants import ( TETROMINO_I_GRID_SHAPE, TETROMINO_J_GRID_SHAPE, TETROMINO_L_GRID_SHAPE, 
-                        TETROMINO_O_GRID_SHAPE, TETROMINO_S_GRID_SHAPE, TETROMINO_Z_GRID_SHAPE,
-                        TETROMINO_T_GRID_SHAPE, TETROMINO_I_GRID_SIZE, TETROMINO_J_GRID_SIZE, TETROMINO_L_GRID_SIZE,
-                        TETROMINO_O_GRID_SIZE, TETROMINO_S_GRID_SIZE, TETROMINO_Z_GRID_SIZE, TETROMINO_T_GRID_SIZE,
-                        TETROMINO_COLORS )
+from .constants import TETROMINO_GRID_SHAPES, TETROMINO_GRID_SIZES, TETROMINO_COLORS
 
 class Gamemode(Enum):
     CLASSIC = 0 # NES style. Locks after one drop interval. Uses simple random style.
@@ -28,43 +24,12 @@ class TetrominoType(IntEnum):
     T_PIECE = 7
 
     @property
-    def shape(self) -> TetrominoType:# TODO : Switch to list
-        match self:
-            case TetrominoType.I_PIECE:
-                return TETROMINO_I_GRID_SHAPE
-            case TetrominoType.J_PIECE:
-                return TETROMINO_J_GRID_SHAPE
-            case TetrominoType.L_PIECE:
-                return TETROMINO_L_GRID_SHAPE
-            case TetrominoType.O_PIECE:
-                return TETROMINO_O_GRID_SHAPE
-            case TetrominoType.S_PIECE:
-                return TETROMINO_S_GRID_SHAPE
-            case TetrominoType.Z_PIECE:
-                return TETROMINO_Z_GRID_SHAPE
-            case TetrominoType.T_PIECE:
-                return TETROMINO_T_GRID_SHAPE
-            case _:
-                raise ValueError
-                pass
+    def shape(self) -> tuple:
+        return TETROMINO_GRID_SHAPES[self.value]
 
     @property
-    def size(self):  # TODO : Switch to list
-        match self:
-            case TetrominoType.I_PIECE:
-                return TETROMINO_I_GRID_SIZE
-            case TetrominoType.J_PIECE:
-                return TETROMINO_J_GRID_SIZE
-            case TetrominoType.L_PIECE:
-                return TETROMINO_L_GRID_SIZE
-            case TetrominoType.O_PIECE:
-                return TETROMINO_O_GRID_SIZE
-            case TetrominoType.S_PIECE:
-                return TETROMINO_S_GRID_SIZE
-            case TetrominoType.Z_PIECE:
-                return TETROMINO_Z_GRID_SIZE
-            case TetrominoType.T_PIECE:
-                return TETROMINO_T_GRID_SIZE
+    def size(self) -> int:
+        return TETROMINO_GRID_SIZES[self.value]
 
     @property     
     def color(self): # TODO : Switch to list
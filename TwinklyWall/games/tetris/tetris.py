@@ -19,36 +19,114 @@
     # Better variable names
 
 import os
+import math
 import pygame
 import numpy
-import copy
 from .tetromino import Tetromino, RandomBag, RandomStyle, TetrominoType
 from game_players import set_player_score_data, get_active_players_for_game
 from players import set_input_handler
 from .enums import Gamemode
 from .constants import ( # TODO : Refactor to group constants by category to make importing less ugly
-    GAME_NAME, GRID_WIDTH, GRID_HEIGHT, GRID_PIXEL_SIZE, 
+    GAME_NAME, GRID_WIDTH, GRID_HEIGHT, GRID_PIXEL_SIZE, GRID_WALL_PADDING, GRID_WALL_VALUE, GRID_WALLED_WIDTH,
     BORDER_COLOR, BORDER_THICKNESS,
     RGBA_OFF_PIXEL_GRAY, RGB_WHITE, RGB_BLACK, RGBA_INVISIBLE_BLACK, FULL_OPACITY_ALPHA,
-    TETROMINO_COLORS, TETROMINO_GHOST_ALPHA, TETROMINO_MAX_GRID_SIZE, KICK_OFFSETS,
-    LINE_FADE_TIME_SECONDS, GAME_OVER_FILENAME, CLASSIC_FIRST_LEVEL_GOAL_FLOOR,
+    TETROMINO_COLORS, TETROMINO_GHOST_ALPHA, TETROMINO_MAX_GRID_SIZE,
+    LINE_FADE_TIME_SECONDS, NANOSECONDS_PER_SECOND, GAME_OVER_FILENAME, CLASSIC_FIRST_LEVEL_GOAL_FLOOR,
     CLASSIC_NEXT_LEVEL_BASE_GOAL, CLASSIC_NES_FPS, CLASSIC_START_LEVEL_INDEX, CLASSIC_LINES_CLEARED_SCORE_REWARD,
-    CLASSIC_POINTS_PER_SOFT_DROP_STEP, CLASSIC_SOFT_DROP_SPEED_DIVISOR, CLASSIC_LEVEL_INDEX_SCORE_OFFSET,
+    CLASSIC_POINTS_PER_SOFT_DROP_STEP, CLASSIC_SOFT_DROP_SPEED_DIVISOR, CLASSIC_LEVEL_INDEX_SCORE_OFFSET, CLASSIC_FRAMES_PER_DROP,
     MODERN_MAX_MOVES_WHILE_DOWN, MODERN_BASE_DROP_SPEED, MODERN_SPEED_MULTIPLIER, MODERN_MAX_DOWN_TIME_SECONDS,
     MODERN_START_LEVEL_INDEX, MODERN_LINES_CLEARED_POINTS_REWARD, MODERN_NEXT_LEVEL_BASE_GOAL, MODERN_RESET_DOWN_GAP,
     MODERN_POINTS_TO_SCORE_MULTPLIER,
 )
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Lock kernel over a piece's filled-cell offsets, and the line clear kernel that slides the kept rows down
+# in place. With numba they compile to plain loops, otherwise the NumPy versions over the same arrays run.
+def _lock_cells_numpy(dead_grid, local_y, local_x, x, y, value):
+    grid_y = local_y + y
+    dead_grid[grid_y, local_x + x] = value
+    return int(grid_y.max())
+
+def _remove_rows_numpy(dead_grid, full_rows):
+    remaining = numpy.delete(dead_grid, full_rows, axis=0)
+    dead_grid[:len(remaining)] = remaining
+    dead_grid[len(remaining):] = 0
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _lock_cells(dead_grid, local_y, local_x, x, y, value):
+        top_row = -1
+        for cell in range(local_y.shape[0]):
+            grid_y = local_y[cell] + y
+            dead_grid[grid_y, local_x[cell] + x] = value
+            if grid_y > top_row:
+                top_row = grid_y
+        return top_row
+
+    @njit(cache=True)
+    def _remove_rows(dead_grid, full_rows): # full_rows ascending
+        kept = 0
+        next_full = 0
+        for grid_y in range(dead_grid.shape[0]):
+            if next_full < full_rows.shape[0] and full_rows[next_full] == grid_y:
+                next_full += 1
+                continue
+            if kept != grid_y:
+                dead_grid[kept, :] = dead_grid[grid_y, :]
+            kept += 1
+        dead_grid[kept:, :] = 0
+else:
+    _lock_cells = _lock_cells_numpy
+    _remove_rows = _remove_rows_numpy
+
+def _grid_axis_layout(cell_pixels, image_pixels, canvas_size):
+    """Compare the single grid image with a cell by cell draw along one axis (rows or columns).
+
+    cell_pixels and image_pixels hold each cell's first pixel in the cell by cell draw and in the image.
+    Returns the cells to blit again on top of the image, ascending, per cell whether repainting that cell
+    alone gives what a full redraw shows, and the pixels the image paints that no cell covers (gaps the
+    cell by cell draw leaves showing the background).
+    """
+    def pixel_owners(first_pixels, cells, owners):
+        # Cells are painted in index order, so the last one covering a pixel is the one left showing
+        for cell in cells:
+            first = first_pixels[cell]
+            for pixel in range(max(first, 0), min(first + GRID_PIXEL_SIZE, canvas_size)):
+                owners[pixel] = cell
+        return owners
+
+    cells = range(len(cell_pixels))
+    drawn_owners = pixel_owners(cell_pixels, cells, [None] * canvas_size)
+    image_owners = pixel_owners(image_pixels, cells, [None] * canvas_size)
+    # Blit again every cell the image leaves showing somewhere it shouldn't, until nothing is left over
+    reblitted = set()
+    while True:
+        owners = pixel_owners(cell_pixels, sorted(reblitted), list(image_owners))
+        wrong = {drawn for drawn, owner in zip(drawn_owners, owners) if drawn is not None and owner != drawn}
+        if wrong <= reblitted:
+            break
+        reblitted |= wrong
+    partial_redraw = [all(drawn_owners[pixel] == cell for pixel in range(max(first, 0), min(first + GRID_PIXEL_SIZE, canvas_size)))
+                      for cell, first in enumerate(cell_pixels)]
+    gap_pixels = [pixel for pixel, (drawn, imaged) in enumerate(zip(drawn_owners, image_owners)) if drawn is None and imaged is not None]
+    return sorted(reblitted), partial_redraw, gap_pixels
+
 class Tetris:
     def __init__(self, canvas, HEADLESS, level, gamemode_selection):
         ### Settings ###
         self.gamemode = Gamemode(gamemode_selection)
         self.headless = HEADLESS
         self.screen = canvas 
-        self.game_over_grid_ceiling = self.screen.get_height() / GRID_PIXEL_SIZE
-        self.screen_grid_height = int(numpy.round(self.game_over_grid_ceiling))
-        self.game_x_offset = (self.screen.get_width() / GRID_PIXEL_SIZE - GRID_WIDTH) - 1 # TODO : Determine why the -1 is needed
-        self.game_y_offset = (self.screen.get_height() / GRID_PIXEL_SIZE - GRID_HEIGHT) - 1 # TODO : Determine why the -1 is needed
+        self.screen_width, self.screen_height = self.screen.get_size() # The canvas never changes size during a game
+        self.game_over_grid_ceiling = self.screen_height / GRID_PIXEL_SIZE
+        self.screen_grid_height = round(self.game_over_grid_ceiling)
+        self.game_x_offset = (self.screen_width / GRID_PIXEL_SIZE - GRID_WIDTH) - 1 # TODO : Determine why the -1 is needed
+        self.game_y_offset = (self.screen_height / GRID_PIXEL_SIZE - GRID_HEIGHT) - 1 # TODO : Determine why the -1 is needed
         
         match self.gamemode:
             case Gamemode.CLASSIC:
@@ -56,10 +134,79 @@ class Tetris:
             case Gamemode.MODERN:
                 self.randomizer = RandomBag(RandomStyle.BAG)
 
-        self.dead_grid  = [[0 for element in range(GRID_WIDTH)] for row in range(GRID_HEIGHT)]
+        # The playfield sits inside a solid border, so collision is one window test with no bounds checks.
+        # dead_grid is a view of the interior: writes to it land in the walled grid directly.
+        self.walled_grid = numpy.full((GRID_HEIGHT + 2 * GRID_WALL_PADDING, GRID_WALLED_WIDTH), GRID_WALL_VALUE, dtype=numpy.uint8)
+        self.dead_grid = self.walled_grid[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT, GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH] # Indexed [y, x], 0 is empty
+        self.dead_grid[:] = 0
+        # Occupancy bitboard of the walled grid: one int per row, bit n set when column n is filled or wall,
+        # used for line detection. For collision the rows are also packed into one int (occupied_board),
+        # GRID_WALLED_WIDTH bits per row, so a whole piece is tested with a single shift and AND.
+        # Pieces are OR'd into both as they lock.
+        self.column_bits = numpy.left_shift(1, numpy.arange(GRID_WALLED_WIDTH, dtype=numpy.int64))
+        self.__sync_occupied_rows()
+        self.full_row_bits = (1 << GRID_WALLED_WIDTH) - 1
+        self.__sync_column_tops()
+        self.empty_row_bits = self.occupied_rows[GRID_WALL_PADDING] # Just the wall columns
+        if HAS_NUMBA: # Compile (or load from cache) the kernels now instead of on the first lock or clear mid-game
+            scratch_grid = self.walled_grid.copy()[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT, GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH]
+            local_y, local_x = Tetromino(TetrominoType.O_PIECE).cells
+            _lock_cells(scratch_grid, local_y, local_x, 0, 0, TetrominoType.O_PIECE.value)
+            _remove_rows(scratch_grid, numpy.zeros(1, dtype=numpy.intp))
         current_dir = os.path.dirname(os.path.abspath(__file__))
         img_path = os.path.join(current_dir, 'assets', GAME_OVER_FILENAME)
         self.game_over_image = pygame.image.load(str(img_path)).convert_alpha()
+        # Full grid redraws go through a color table into one opaque grid-sized surface
+        self.grid_surface = pygame.Surface((GRID_WIDTH * GRID_PIXEL_SIZE, GRID_HEIGHT * GRID_PIXEL_SIZE))
+        # Colors pre-mapped to the surface's pixel format, and a reused [x, y] pixel buffer viewed as blocks
+        self.grid_color_table = numpy.array([self.grid_surface.map_rgb(color) for color in TETROMINO_COLORS], dtype=numpy.uint32)
+        self.grid_pixels = numpy.zeros((GRID_WIDTH * GRID_PIXEL_SIZE, GRID_HEIGHT * GRID_PIXEL_SIZE), dtype=numpy.uint32)
+        self.grid_pixel_blocks = self.grid_pixels.reshape(GRID_WIDTH, GRID_PIXEL_SIZE, GRID_HEIGHT, GRID_PIXEL_SIZE)
+        self.grid_cell_colors = numpy.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=numpy.uint32) # One color per cell, also reused
+        # Pixel position of every grid column and row (walls included, so pieces drawn past the edge work too),
+        # computed once with the same truncation pygame applies to the fractional offsets.
+        # Indexed [grid_x + GRID_WALL_PADDING] and [grid_y + GRID_WALL_PADDING].
+        self.column_pixels = [int((grid_x + self.game_x_offset) * GRID_PIXEL_SIZE) for grid_x in range(-GRID_WALL_PADDING, GRID_WIDTH + GRID_WALL_PADDING)]
+        self.row_pixels = [int((GRID_HEIGHT - grid_y + self.game_y_offset) * GRID_PIXEL_SIZE) for grid_y in range(-GRID_WALL_PADDING, GRID_HEIGHT + GRID_WALL_PADDING)]
+        # Anchored on the bottom-left cell. The offsets are fractional and pygame truncates positions toward zero,
+        # so on some canvas sizes rows or columns land a pixel off from where the single image puts them, overlapping
+        # a neighbour or leaving a one pixel gap. Those rows and columns are blitted again per cell on top and the
+        # gaps cleared back to the background, so the result matches a cell by cell draw.
+        bottom_row_position = self.row_pixels[GRID_WALL_PADDING]
+        left_column_position = self.column_pixels[GRID_WALL_PADDING]
+        self.grid_surface_position = (left_column_position, bottom_row_position - (GRID_HEIGHT - 1) * GRID_PIXEL_SIZE)
+        self.grid_truncated_rows, self.partial_redraw_rows, gap_rows = _grid_axis_layout(
+            self.row_pixels[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT],
+            [bottom_row_position - grid_y * GRID_PIXEL_SIZE for grid_y in range(GRID_HEIGHT)],
+            self.screen_height)
+        self.grid_truncated_columns, self.partial_redraw_columns, gap_columns = _grid_axis_layout(
+            self.column_pixels[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH],
+            [left_column_position + grid_x * GRID_PIXEL_SIZE for grid_x in range(GRID_WIDTH)],
+            self.screen_width)
+        # Clipped here because Surface.fill moves a rect hanging off the top or left edge onto the canvas instead of clipping it
+        canvas_rect = self.canvas_rect = self.screen.get_rect()
+        image_x, image_y = self.grid_surface_position
+        self.grid_gap_rects = ([pygame.Rect(image_x, pixel_y, GRID_WIDTH * GRID_PIXEL_SIZE, 1).clip(canvas_rect) for pixel_y in gap_rows]
+                               + [pygame.Rect(pixel_x, image_y, 1, GRID_HEIGHT * GRID_PIXEL_SIZE).clip(canvas_rect) for pixel_x in gap_columns])
+        self.background_color = RGBA_INVISIBLE_BLACK if self.headless else RGBA_OFF_PIXEL_GRAY # Help the preview pixels to stand out from the black background
+        # The border beside each wall never moves, so its rects are built once too
+        x_left : int = int(self.game_x_offset * GRID_PIXEL_SIZE) - BORDER_THICKNESS
+        x_right : int = int(self.game_x_offset * GRID_PIXEL_SIZE + (GRID_WIDTH * GRID_PIXEL_SIZE))
+        self.border_rects = (pygame.Rect(x_left, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE).clip(canvas_rect),
+                             pygame.Rect(x_right, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE).clip(canvas_rect))
+        # One opaque pre-filled block per color for repainting single cells
+        self.block_surfaces = []
+        for color in TETROMINO_COLORS:
+            block_surface = pygame.Surface((GRID_PIXEL_SIZE, GRID_PIXEL_SIZE))
+            block_surface.fill(color)
+            self.block_surfaces.append(block_surface)
+        # Dirty tracking for the canvas: the grid cells repainted from dead_grid on the next grid draw (the cells the
+        # ghost/live piece painted, plus any cell a lock filled), and whether everything must be redrawn instead
+        # (set when a line clear shifts the whole grid)
+        self.piece_cells_drawn = []
+        self.full_redraw_needed = True
+        self.grid_stale_rows = (0, GRID_HEIGHT) # [low, high) range of dead_grid rows grid_surface no longer matches (set on lock and clear)
+        self.line_fade_surface = pygame.Surface((GRID_PIXEL_SIZE * GRID_WIDTH, GRID_PIXEL_SIZE), pygame.SRCALPHA)
         self.fading_lines = [] # Structure: [ (line_index 1, alpha 1.0, time_elapsed 0.0) ] # TODO : Objectify so that structure is built-in
 
         ### Leveling ###
@@ -68,7 +215,8 @@ class Tetris:
         self.total_lines_cleared = 0
         self.combo = 0
         self.drop_interval = 0.0
-        self.drop_time_elapsed = 0.0
+        self.drop_interval_ns = 0
+        self.drop_time_elapsed_ns = 0 # Integer, and only the spent intervals are subtracted, so no time is lost
         self.next_level_goal = 0
         
         self.__initialize_gamemode_specific_parameters()
@@ -78,6 +226,7 @@ class Tetris:
         self.live_tetromino = None
         self.cannot_move_down = False
         self.is_playing = True
+        self.game_over_frame_drawn = False
 
         self.__spawn_tetromino()
 
@@ -86,10 +235,10 @@ class Tetris:
             case Gamemode.CLASSIC:
                 self.level_index = CLASSIC_START_LEVEL_INDEX
                 # This equation comes from the NES Tetris equation for determining the first level goal. It only happens at the start of the game
-                self.next_level_goal = numpy.min(
-                    (self.level_index * CLASSIC_NEXT_LEVEL_BASE_GOAL + CLASSIC_NEXT_LEVEL_BASE_GOAL,
-                        numpy.max((CLASSIC_FIRST_LEVEL_GOAL_FLOOR, 
-                                self.level_index * CLASSIC_NEXT_LEVEL_BASE_GOAL - CLASSIC_FIRST_LEVEL_GOAL_FLOOR))))
+                self.next_level_goal = min(
+                    self.level_index * CLASSIC_NEXT_LEVEL_BASE_GOAL + CLASSIC_NEXT_LEVEL_BASE_GOAL,
+                    max(CLASSIC_FIRST_LEVEL_GOAL_FLOOR, 
+                        self.level_index * CLASSIC_NEXT_LEVEL_BASE_GOAL - CLASSIC_FIRST_LEVEL_GOAL_FLOOR))
                 self.lines_cleared = 0
                 self.soft_drop_streak = 0 # Every cell that is soft-dropped adds a point as long as you don't release before the piece locks
                 self.is_soft_dropping = False # Set by player input, equates to whether player is holding drop button
@@ -101,17 +250,9 @@ class Tetris:
                 self.down_time_elapsed = 0.0
                 self.next_level_goal = MODERN_NEXT_LEVEL_BASE_GOAL * self.level_index
 
-    def __draw_square(self, color, position, alpha = FULL_OPACITY_ALPHA):
-        if len(color) == 3: # If color is in RGB form
-            color = (*color, alpha) # Add opacity
-        
-        pygame.draw.rect(self.screen, color, (position[0], position[1], GRID_PIXEL_SIZE, GRID_PIXEL_SIZE))
-
     def __draw_border(self):
-        x_left : int = int(self.game_x_offset * GRID_PIXEL_SIZE) - BORDER_THICKNESS
-        x_right : int = int(self.game_x_offset * GRID_PIXEL_SIZE + (GRID_WIDTH * GRID_PIXEL_SIZE))
-        pygame.draw.rect(self.screen, BORDER_COLOR, (x_left, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE,))
-        pygame.draw.rect(self.screen, BORDER_COLOR, (x_right, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE,))
+        for border_rect in self.border_rects:
+            self.screen.fill(BORDER_COLOR, border_rect)
 
     def __draw_next_piece_preview(self):
         pass
@@ -127,15 +268,10 @@ class Tetris:
         
         # self.__draw_tetromino(grid_position=(0 - tetromino.type.size, self.screen_grid_height - tetromino.type.size), tetromino=tetromino)
 
-    def __draw_ghost_piece(self): # TODO : Write comment explaining this
-        tetromino = copy.copy(self.live_tetromino)
-        pos = self.live_tetromino.grid_position
-        for y in range(pos[1], -tetromino.type.size, -1): 
-            pos = (pos[0], y)
-            if not self.__check_move_validity(pos):
-                pos = (pos[0], y + 1)
-                break
-        
+    def __draw_ghost_piece(self): # Outline of where the live piece would land if hard dropped
+        tetromino = self.live_tetromino # Only drawn at another position, so no copy is needed
+        x, y = tetromino.grid_position
+        pos = (x, y - self.__landing_distance())
         self._draw_tetromino(grid_position=pos, tetromino=tetromino, opacity=TETROMINO_GHOST_ALPHA)
 
     def _draw_tetromino(self, grid_position = None, tetromino = None, opacity = FULL_OPACITY_ALPHA):
@@ -147,37 +283,85 @@ class Tetris:
         if tetromino is None:
             tetromino = self.live_tetromino
 
-        shape = tetromino.shape_instance
-        for local_y, grid_y in enumerate(range(pos[1], pos[1] + tetromino.type.size)):
-            y_position = GRID_HEIGHT - grid_y + self.game_y_offset
-            y_position *= GRID_PIXEL_SIZE
-            for local_x, grid_x in enumerate(range(pos[0], pos[0] + tetromino.type.size)):
-                x_position = grid_x + self.game_x_offset 
-                x_position *= GRID_PIXEL_SIZE
-                is_cell_filled = shape[-local_y + tetromino.type.size -1][local_x] # Invert y because the origin is in the bottom left of the grid
-                if is_cell_filled and tetromino.type is not None:
-                    self.__draw_square(tetromino.type.color, (x_position, y_position), opacity)
+        # Everything the loop touches is resolved once up front
+        color = tetromino.type.color
+        if len(color) == 3: # If color is in RGB form
+            color = (*color, opacity) # Add opacity
+        fill = self.screen.fill # Writes the color as is, alpha included, like draw.rect did but without the shape dispatch
+        canvas_rect = self.canvas_rect
+        row_pixels = self.row_pixels
+        column_pixels = self.column_pixels
+        cells_drawn = self.piece_cells_drawn
+        local_y, local_x = tetromino.cells
+        for grid_y, grid_x in zip((local_y + pos[1]).tolist(), (local_x + pos[0]).tolist()):
+            y_position = row_pixels[grid_y + GRID_WALL_PADDING]
+            x_position = column_pixels[grid_x + GRID_WALL_PADDING]
+            if x_position < 0 or y_position < 0: # fill would move the cell onto the canvas rather than clip it like draw.rect
+                fill(color, canvas_rect.clip((x_position, y_position, GRID_PIXEL_SIZE, GRID_PIXEL_SIZE)))
+            else:
+                fill(color, (x_position, y_position, GRID_PIXEL_SIZE, GRID_PIXEL_SIZE))
+            cells_drawn.append((grid_x, grid_y)) # Repainted from dead_grid next frame
 
 
     def __draw_grid(self):
-        if not self.headless:
-            self.screen.fill(RGBA_OFF_PIXEL_GRAY) # Help the preview pixels to stand out from the black background
-            pygame.display.flip()
-        else:
-            self.screen.fill(RGBA_INVISIBLE_BLACK)
-
-        # Draw dead_grid
-        for y_index, column in enumerate(self.dead_grid):
-            y_position = GRID_HEIGHT - y_index + self.game_y_offset
-            for x_index, value in enumerate(column): 
-                x_position = x_index + self.game_x_offset 
-                cell_index = self.dead_grid[y_index][x_index]
-                pos = (x_position * GRID_PIXEL_SIZE, y_position * GRID_PIXEL_SIZE)
-                color = RGB_WHITE
-                color = TETROMINO_COLORS[cell_index] # TODO : OOB check Soft fail to default color
-
-                self.__draw_square(color, pos)
-                
+        # Between line clears only the pieces move or lock, so repaint just the cells they covered or filled.
+        # Redraw everything when the grid shifted or a line clear overlay was blended on top.
+        full_redraw = self.full_redraw_needed
+        self.full_redraw_needed = bool(self.fading_lines) # The frame after a fade ends must clear it too
+        # Everything the cell loops touch is resolved once up front
+        screen = self.screen
+        dead_grid = self.dead_grid
+        block_surfaces = self.block_surfaces
+        row_pixels = self.row_pixels
+        column_pixels = self.column_pixels
+        cells_drawn = self.piece_cells_drawn
+        if not full_redraw:
+            blit_sequence = []
+            partial_redraw_rows = self.partial_redraw_rows
+            partial_redraw_columns = self.partial_redraw_columns
+            for grid_x, grid_y in cells_drawn:
+                if not (0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT
+                        and partial_redraw_rows[grid_y] and partial_redraw_columns[grid_x]): # Outside the grid (e.g. a blocked spawn) or overlapping another row or column
+                    full_redraw = True
+                    break
+                position = (column_pixels[grid_x + GRID_WALL_PADDING], row_pixels[grid_y + GRID_WALL_PADDING])
+                blit_sequence.append((block_surfaces[dead_grid.item(grid_y, grid_x)], position))
+        if not full_redraw:
+            screen.blits(blit_sequence, doreturn=False)
+            cells_drawn.clear()
+            return
+
+        cells_drawn.clear()
+        screen.fill(self.background_color)
+        self.__draw_border()
+
+        # Draw dead_grid, every cell including the empty (black) ones: map cell values through the color
+        # table (top row first, [x, y] for surfarray), broadcast each cell over its block and blit it once.
+        # The surface is kept between redraws, so a redraw that only wipes a fade overlay reuses it as is.
+        # Only the rows a lock or clear touched are recolored; the image is top row first, so they map to the flipped range.
+        low, high = self.grid_stale_rows
+        if low < high:
+            image_rows = slice(GRID_HEIGHT - high, GRID_HEIGHT - low)
+            cell_colors = numpy.take(self.grid_color_table, dead_grid[low:high][::-1].T, out=self.grid_cell_colors[:, image_rows]) # TODO : OOB check Soft fail to default color
+            self.grid_pixel_blocks[:, :, image_rows, :] = cell_colors[:, None, :, None]
+            pygame.surfarray.blit_array(self.grid_surface, self.grid_pixels)
+            self.grid_stale_rows = (GRID_HEIGHT, 0)
+        screen.blit(self.grid_surface, self.grid_surface_position)
+        blit_sequence = []
+        for grid_y in self.grid_truncated_rows:
+            y_position = row_pixels[grid_y + GRID_WALL_PADDING]
+            for grid_x, cell_index in enumerate(dead_grid[grid_y].tolist()):
+                x_position = column_pixels[grid_x + GRID_WALL_PADDING]
+                blit_sequence.append((block_surfaces[cell_index], (x_position, y_position)))
+        for grid_x in self.grid_truncated_columns:
+            x_position = column_pixels[grid_x + GRID_WALL_PADDING]
+            for grid_y, cell_index in enumerate(dead_grid[:, grid_x].tolist()):
+                y_position = row_pixels[grid_y + GRID_WALL_PADDING]
+                blit_sequence.append((block_surfaces[cell_index], (x_position, y_position)))
+        screen.blits(blit_sequence, doreturn=False)
+        background_color = self.background_color
+        for gap_rect in self.grid_gap_rects:
+            screen.fill(background_color, gap_rect)
 
     def __drop_tetromino(self, is_soft_drop = False) -> bool:
         if not self.__move_tetromino(offset=(0, -1)):
@@ -201,11 +385,52 @@ class Tetris:
         return True
 
     def __hard_drop_tetromino(self, was_player_called = False):
-        for _ in range(GRID_HEIGHT):
-            if self.__drop_tetromino() and was_player_called:
-                self.__award_score(2)
+        # Snap straight to the landing row, then settle what the row by row drops used to add up
+        distance = self.__landing_distance()
+        if distance > 0:
+            x, y = self.live_tetromino.grid_position
+            # Only the first step down could reset the lock delay; every later one starts with it already reset
+            if self.cannot_move_down and self.__check_move_validity(test_position=(x, y - 1 - MODERN_RESET_DOWN_GAP)):
+                self.__reset_down()
+            self.live_tetromino.grid_position = (x, y - distance)
+
+            match self.gamemode:
+                case Gamemode.CLASSIC:
+                    if self.is_soft_dropping:
+                        self.soft_drop_streak += distance
+                case Gamemode.MODERN:
+                    self.__award_score(CLASSIC_POINTS_PER_SOFT_DROP_STEP * distance)
+            if was_player_called:
+                self.__award_score(2 * distance)
         self.__lock_piece()
 
+    def __landing_distance(self) -> int:
+        # Rows the live piece can fall straight down. Normally the piece is above the stack, so the gap
+        # between each column's lowest cell and that column's top is enough; the smallest gap wins.
+        tetromino = self.live_tetromino
+        x, y = tetromino.grid_position
+        column_tops = self.column_tops
+        distance = GRID_HEIGHT
+        for local_x, local_y in tetromino.column_bottoms:
+            gap = y + local_y - column_tops[x + local_x]
+            if gap < 0: # Tucked under an overhang, the column top says nothing about what is below
+                return self.__stepped_landing_distance()
+            distance = min(distance, gap)
+        return distance
+
+    def __stepped_landing_distance(self) -> int:
+        # Starts at the current position, so a piece spawned into the stack gets -1 (ghost drawn just above it)
+        x, y = self.live_tetromino.grid_position
+        free_rows = 0
+        while self.__check_move_validity(test_position=(x, y - free_rows)):
+            free_rows += 1
+        return free_rows - 1
+
+    def __sync_column_tops(self):
+        # Height of each column's stack: one above its highest filled cell, 0 when empty
+        filled = self.dead_grid != 0
+        self.column_tops = numpy.where(filled.any(axis=0), GRID_HEIGHT - numpy.argmax(filled[::-1], axis=0), 0).tolist()
+
     def __spawn_tetromino(self):
         piece_type = self.randomizer.pull_piece()
         size = piece_type.size
@@ -213,70 +438,81 @@ class Tetris:
         self.live_tetromino = Tetromino(piece_type, grid_position=((GRID_WIDTH - size) // 2, GRID_HEIGHT - size)) # TODO : Magic number?
    
     def __move_tetromino(self, offset) -> bool:
-        new_position = (self.live_tetromino.grid_position[0] + offset[0], self.live_tetromino.grid_position[1] + offset[1])
+        tetromino = self.live_tetromino
+        x, y = tetromino.grid_position
+        new_position = (x + offset[0], y + offset[1])
 
         if not self.__check_move_validity(test_position=new_position):
             return False
-        self.live_tetromino.grid_position = new_position
+        tetromino.grid_position = new_position
         return True
 
     def __check_move_validity(self, test_position) -> bool:
         if test_position is None:
             test_position = self.live_tetromino.grid_position
 
-        size = self.live_tetromino.type.size
-
-        for local_y, grid_y in enumerate(range(test_position[1], test_position[1] + size)):
-            for local_x, grid_x in enumerate(range(test_position[0], test_position[0] + size)):
-                is_cell_filled = self.live_tetromino.shape_instance[-local_y + size - 1][local_x]
-                if is_cell_filled: 
-                    if grid_x < 0 or grid_y < 0 or grid_x >= GRID_WIDTH or grid_y > GRID_HEIGHT: 
-                        return False
-                    if self.dead_grid[grid_y][grid_x] != 0:
-                        return False
-                    
-        return True
+        x, y = test_position
+        # Walls, floor and everything above the top row are filled bits of the board, so there are no bounds
+        # checks: a piece past the right wall runs into the next row's left wall bits, and every position
+        # tested is at most one move, kick or drop step from a valid one, which stays inside the padding.
+        # The mask comes already shifted to its column, leaving one row shift.
+        return not (self.live_tetromino.packed_columns[x + GRID_WALL_PADDING] << ((y + GRID_WALL_PADDING) * GRID_WALLED_WIDTH)) & self.occupied_board
+
+    def __sync_occupied_rows(self):
+        self.occupied_rows = ((self.walled_grid != 0) @ self.column_bits).tolist()
+        self.__pack_occupied_board()
+
+    def __pack_occupied_board(self):
+        occupied_board = 0
+        for row in reversed(self.occupied_rows):
+            occupied_board = (occupied_board << GRID_WALLED_WIDTH) | row
+        self.occupied_board = occupied_board | (-1 << (len(self.occupied_rows) * GRID_WALLED_WIDTH)) # Negative, so every bit above is set
 
     def __rotate_tetromino(self, clockwise = True) -> bool:
         if self.live_tetromino.type == TetrominoType.O_PIECE: # O (square) piece doesn't rotate
             return True
 
         loops = 1 if clockwise else 3 # Three rights make a left
-        initial_shape = self.live_tetromino.shape_instance
         initial_rot = self.live_tetromino.rotation
         desired_rot = (initial_rot + loops) % 4 # TODO : Make Enum for rotation
 
-        for _ in range(loops):
-            self.__rotate_shape_clockwise()
-
-        if self.__check_move_validity(self.live_tetromino.grid_position):
-            self.live_tetromino.rotation = desired_rot
-            return True
-
-        piece_group = 1 if self.live_tetromino.type == TetrominoType.I_PIECE else 0
-        for offset in KICK_OFFSETS[piece_group][clockwise][desired_rot]:
-            if self.__move_tetromino(offset):
+        # The shape is looked up from the precomputed rotations, so rotating is just an index change
+        # followed by the kick tests, the first of which is no kick at all
+        tetromino = self.live_tetromino
+        kick_tests = tetromino.kick_offsets[desired_rot]
+        x, y = tetromino.grid_position
+        tetromino.rotation = desired_rot
+        for offset_x, offset_y in kick_tests:
+            kicked_position = (x + offset_x, y + offset_y)
+            if self.__check_move_validity(kicked_position):
+                tetromino.grid_position = kicked_position
                 return True
 
-        self.live_tetromino.shape_instance = initial_shape
         self.live_tetromino.rotation = initial_rot  
         return False
 
-    def __rotate_shape_clockwise(self):
-        self.live_tetromino.shape_instance = [list(reversed(element)) for element in zip(*self.live_tetromino.shape_instance)]
-
     def __lock_piece(self):
         self.__move_tetromino(offset=(0, -1))
-        pos = self.live_tetromino.grid_position
-        size = self.live_tetromino.type.size
-
-        for local_y, grid_y in enumerate(range(pos[1], pos[1] + size)):
-            for local_x, grid_x in enumerate(range(pos[0], pos[0] + size)):
-                is_cell_filled = self.live_tetromino.shape_instance[-local_y + size - 1][local_x] # Invert y because the origin is in the bottom left of the grid
-                if is_cell_filled:
-                    self.dead_grid[grid_y][grid_x] = self.live_tetromino.type.value
-                    if grid_y >= self.game_over_grid_ceiling:
-                        self.__game_over()
+        tetromino = self.live_tetromino
+        local_y, local_x = tetromino.cells
+        x, y = tetromino.grid_position
+        top_row = _lock_cells(self.dead_grid, local_y, local_x, x, y, tetromino.type.value)
+        occupied_rows = self.occupied_rows
+        row = y + GRID_WALL_PADDING
+        left = x + GRID_WALL_PADDING
+        for bits in tetromino.row_bits:
+            occupied_rows[row] |= bits << left
+            row += 1
+        self.occupied_board |= tetromino.packed_columns[left] << ((y + GRID_WALL_PADDING) * GRID_WALLED_WIDTH)
+        column_tops = self.column_tops
+        cells_drawn = self.piece_cells_drawn
+        for grid_y, grid_x in zip((local_y + y).tolist(), (local_x + x).tolist()):
+            if grid_y >= column_tops[grid_x]:
+                column_tops[grid_x] = grid_y + 1
+            cells_drawn.append((grid_x, grid_y)) # Only these cells changed, unless a line clear follows
+        self.__mark_grid_rows_stale(y + int(local_y[0]), top_row + 1) # Cells are bottom row first
+        if top_row >= self.game_over_grid_ceiling:
+            self.__game_over()
 
         if self.gamemode == Gamemode.CLASSIC:
             self.__award_score(self.soft_drop_streak)
@@ -302,81 +538,74 @@ class Tetris:
     def __calc_drop_speed(self):
         match self.gamemode:
             case Gamemode.MODERN: # This algorithm is used by Tetris Worlds to calculate how the drop interval decreases by level
-                self.drop_interval = numpy.power((MODERN_BASE_DROP_SPEED - ((self.level_index - 1) * MODERN_SPEED_MULTIPLIER)), self.level_index - 1)
+                self.drop_interval = math.pow((MODERN_BASE_DROP_SPEED - ((self.level_index - 1) * MODERN_SPEED_MULTIPLIER)), self.level_index - 1)
                 
             case Gamemode.CLASSIC:
-                frames_per_drop = 48 # TODO : Move magic number to constants
-                match self.level_index: # Values match NES Marathon mode 
-                    # TODO : Refactor with enum in constants file
-                    case 0:
-                        frames_per_drop = 48 
-                    case 1:
-                        frames_per_drop = 43 
-                    case 2:
-                        frames_per_drop = 38  
-                    case 3: 
-                        frames_per_drop = 33
-                    case 4: 
-                        frames_per_drop = 28
-                    case 5: 
-                        frames_per_drop = 23
-                    case 6: 
-                        frames_per_drop = 18
-                    case 7: 
-                        frames_per_drop = 13
-                    case 8: 
-                        frames_per_drop = 8
-                    case 9: 
-                        frames_per_drop = 6
-                    case level if 10 <= level < 13: 
-                        frames_per_drop = 5
-                    case level if 13 <= level < 16: 
-                        frames_per_drop = 4
-                    case level if 16 <= level < 19: 
-                        frames_per_drop = 3
-                    case level if 19 <= level < 28: 
-                        frames_per_drop = 2
-                    case level if 29 <= level: 
-                        frames_per_drop = 1
-
+                frames_per_drop = CLASSIC_FRAMES_PER_DROP[min(self.level_index, len(CLASSIC_FRAMES_PER_DROP) - 1)]
                 self.drop_interval = frames_per_drop / CLASSIC_NES_FPS
                 if self.is_soft_dropping:
                     self.drop_interval /= CLASSIC_SOFT_DROP_SPEED_DIVISOR
 
+        self.drop_interval_ns = max(1, int(self.drop_interval * NANOSECONDS_PER_SECOND))
+
     def __clear_lines(self):
-        keep_clearing = True
-        while keep_clearing:
-            lines_cleared = 0 
-            for y, row in enumerate(self.dead_grid): 
-                if 0 not in row: # Row is full
-                    self.dead_grid.pop(y)
-                    self.dead_grid.insert(GRID_HEIGHT, [0 for element in range(GRID_WIDTH)])
-                    lines_cleared += 1
-                    self.fading_lines.append((y, 1.0, 0.0)) # TODO : Move magic number to constants
-
-            self.total_lines_cleared += lines_cleared
-                        
-            self.__score_lines(lines_cleared) 
-            keep_clearing = lines_cleared > 0
+        # A row is full when its bitboard row has every column bit set, so detection is one int compare per row
+        occupied_rows = self.occupied_rows
+        grid_rows = occupied_rows[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT]
+        full_row_bits = self.full_row_bits
+        if full_row_bits not in grid_rows: # Most locks clear nothing
+            return
+
+        # One pass splits the rows: full ones fade out, the rest keep their order at the bottom
+        full_rows = []
+        remaining_rows = []
+        for y, row in enumerate(grid_rows):
+            if row == full_row_bits:
+                full_rows.append(y)
+            else:
+                remaining_rows.append(row)
+        lines_cleared = len(full_rows)
+
+        for y in full_rows:
+            self.fading_lines.append((y, 1.0, 0.0)) # TODO : Move magic number to constants
+
+        # Refill the top with empty rows, in both grids
+        remaining_rows.extend([self.empty_row_bits] * lines_cleared)
+        occupied_rows[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT] = remaining_rows
+        self.__pack_occupied_board()
+        # Rows from the lowest cleared one up to the old top of the stack shift; everything above was and stays empty
+        self.__mark_grid_rows_stale(full_rows[0], max(max(self.column_tops), full_rows[-1] + 1))
+        _remove_rows(self.dead_grid, numpy.array(full_rows, dtype=numpy.intp))
+        self.__sync_column_tops()
+        self.full_redraw_needed = True
+
+        self.total_lines_cleared += lines_cleared
+        self.__score_lines(lines_cleared)
+
+    def __mark_grid_rows_stale(self, low, high):
+        stale_low, stale_high = self.grid_stale_rows
+        self.grid_stale_rows = (max(0, min(stale_low, low)), min(GRID_HEIGHT, max(stale_high, high)))
 
     def __animate_line_clears(self, delta_time): # Runs every tick
-        for index, (line_y, alpha, time_elapsed) in enumerate(self.fading_lines):
+        # Rebuilt in one pass rather than popped mid-iteration, so one line finishing doesn't skip the others
+        still_fading = []
+        for line_y, alpha, time_elapsed in self.fading_lines:
 
             time_elapsed += delta_time
             if time_elapsed >= LINE_FADE_TIME_SECONDS:
-                self.fading_lines.pop(index)
-                return
+                continue
             
             alpha = ((LINE_FADE_TIME_SECONDS - time_elapsed) / LINE_FADE_TIME_SECONDS) * FULL_OPACITY_ALPHA
             width = GRID_PIXEL_SIZE * GRID_WIDTH
             height = GRID_PIXEL_SIZE
-            transparent_layer = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(transparent_layer, (*RGB_WHITE, alpha), (0,0, width, height))
+            transparent_layer = self.line_fade_surface # Reused, only its color and alpha change per line
+            transparent_layer.fill((*RGB_WHITE, alpha))
             transparent_layer.set_alpha(alpha)
-            self.fading_lines[index] = (line_y, alpha, time_elapsed)
-            start_x = self.game_x_offset * GRID_PIXEL_SIZE
-            start_y = (GRID_HEIGHT - line_y + self.game_y_offset) * GRID_PIXEL_SIZE
+            still_fading.append((line_y, alpha, time_elapsed))
+            start_x = self.column_pixels[GRID_WALL_PADDING]
+            start_y = self.row_pixels[line_y + GRID_WALL_PADDING]
             self.screen.blit(transparent_layer, (start_x, start_y, width, height))
+        self.fading_lines = still_fading
 
     def __award_score(self, score_amount):
         if score_amount <= 0:
@@ -424,18 +653,23 @@ class Tetris:
         self.is_playing = False
 
     def __draw_game_over_frame(self):
+        # The game over screen never changes, so draw it onto the canvas once and leave it there
+        if not self.game_over_frame_drawn:
+            self.__draw_game_over_image()
+            self.game_over_frame_drawn = True
+        if not self.headless:
+            pygame.display.update()
+
+    def __draw_game_over_image(self):
         self.screen.fill(RGB_BLACK)
-        image_height = self.screen.get_height()
+        image_height = self.screen_height
         image_width = GRID_WIDTH * GRID_PIXEL_SIZE
         scaled_image = pygame.transform.scale(self.game_over_image, (image_width, image_height))
         scaled_rect = scaled_image.get_rect()
-        scaled_rect.center = (self.screen.get_width() / 2, self.screen.get_height() / 2) # Is the 2 a magic number here? # TODO : Refactor to a function
+        scaled_rect.center = (self.screen_width / 2, self.screen_height / 2) # Is the 2 a magic number here? # TODO : Refactor to a function
         self.screen.blit(scaled_image, scaled_rect)
-        pygame.display.update()
 
     def tick(self, delta_time, fps): # Called in main
-        print("Start tick")
-
         if not self.is_playing:
             self.__draw_game_over_frame()
             return
@@ -453,19 +687,21 @@ class Tetris:
                 if self.cannot_move_down:
                     self.__lock_piece()
 
-        self.drop_time_elapsed += delta_time
-        if self.drop_time_elapsed >= self.drop_interval:
-            self.__drop_tetromino()
-            self.drop_time_elapsed = 0
+        # Drop once for every whole interval that passed, so a long frame still drops every row it owed
+        self.drop_time_elapsed_ns += int(delta_time * NANOSECONDS_PER_SECOND)
+        while self.drop_time_elapsed_ns >= self.drop_interval_ns:
+            self.drop_time_elapsed_ns -= self.drop_interval_ns
+            if not self.__drop_tetromino(): # Landed, the rest of the backlog would only push into the stack
+                self.drop_time_elapsed_ns = 0
+                break
     
         self.__draw_grid()
         self.__draw_ghost_piece()
         self.__animate_line_clears(delta_time)
-        self.__draw_border()
         self._draw_tetromino()
         self.__draw_next_piece_preview()
-
-        print("Finish tick")
+        if not self.headless: # Present once, after everything for this tick is drawn
+            pygame.display.flip()
 
 
         if self.gamemode == Gamemode.CLASSIC:
@@ -481,27 +717,15 @@ class Tetris:
     ## Inputs ##
 
     def __bind_input(self, tetris):
-        players = get_active_players_for_game(GAME_NAME)
-        for i, player in enumerate(players):
-            def make_input_handler(player_index=i):
-                def handle_tetris_input(player_obj, payload):
-                    cmd = payload.get("cmd")  # TODO : Remove magic string, replace with constant
-                    match cmd:
-                        case "MOVE_LEFT":  # TODO : Remove magic string, replace with constant
-                            tetris.move_piece_left()
-                        case "MOVE_RIGHT":
-                            tetris.__move_piece_right()
-                        case "ROTATE_RIGHT":
-                            tetris.rotate_clockwise()
-                        case "ROTATE_LEFT":
-                            tetris.rotate_counterclockwise()
-                        case "MOVE_DOWN":
-                            tetris.drop_piece()
-                        case "HARD_DROP":
-                            tetris.hard_drop_piece()
-                return handle_tetris_input
-            set_input_handler(player.player_id, make_input_handler())
-       
+        # One handler shared by every player; commands are looked up in the dispatch table below
+        def handle_tetris_input(player_obj, payload):
+            command = Tetris._INPUT_COMMANDS.get(payload.get("cmd"))
+            if command is not None:
+                command(tetris)
+
+        for player in get_active_players_for_game(GAME_NAME):
+            set_input_handler(player.player_id, handle_tetris_input)
+
     def move_piece_left(self):
         self.__move_tetromino(offset=(-1,0))
         self.__moved()
@@ -532,9 +756,28 @@ class Tetris:
                 if not is_pressed:
                     self.soft_drop_streak = 0
 
+    def soft_drop_step(self):
+        # One row per MOVE_DOWN. The phone sends no release, so classic's held soft drop is never started here,
+        # it would otherwise stay on (halved interval, streak points) for the rest of the game
+        match self.gamemode:
+            case Gamemode.MODERN:
+                self.drop_piece(is_pressed=True)
+            case Gamemode.CLASSIC:
+                self.__drop_tetromino()
+
     def hard_drop_piece(self):
         if self.gamemode == Gamemode.CLASSIC:
             return
 
         self.__hard_drop_tetromino(was_player_called=True)
-        self.__moved(wants_to_lock=True)
\ No newline at end of file
+        self.__moved(wants_to_lock=True)
+
+    # Player commands to the action each one runs, called with the Tetris instance
+    _INPUT_COMMANDS = { # TODO : Remove magic strings, replace with constants
+        "MOVE_LEFT": move_piece_left,
+        "MOVE_RIGHT": move_piece_right,
+        "ROTATE_RIGHT": rotate_clockwise,
+        "ROTATE_LEFT": rotate_counterclockwise,
+        "MOVE_DOWN": soft_drop_step,
+        "HARD_DROP": hard_drop_piece,
+    }
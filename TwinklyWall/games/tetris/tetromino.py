@@ -1,19 +1,98 @@
 # All code in this file must be handwritten! No AI allowed!
 import random
+import numpy
 from .enums import TetrominoType, RandomStyle
-import copy
+from .constants import GRID_WALLED_WIDTH, KICK_OFFSETS_JLSTZ, KICK_OFFSETS_I
+
+# Every rotation of every piece, built once at import and shared by every instance.
+# Indexed [piece_type][rotation], rotation counts clockwise quarter turns.
+SHAPE_ROTATIONS = [None] * (len(TetrominoType) + 1) # Tuples of tuples, top row first, as written in constants
+GRID_MASK_ROTATIONS = [None] * (len(TetrominoType) + 1) # Bottom row first, matching the grid's bottom left origin
+CELL_ROTATIONS = [None] * (len(TetrominoType) + 1) # (local_y, local_x) index arrays of each grid mask's filled cells
+ROW_BITS_ROTATIONS = [None] * (len(TetrominoType) + 1) # One int per grid mask row, bit n set when local_x n is filled
+COLUMN_BOTTOMS_ROTATIONS = [None] * (len(TetrominoType) + 1) # (local_x, lowest filled local_y) for each filled column
+PACKED_ROTATIONS = [None] * (len(TetrominoType) + 1) # row_bits packed into one int, GRID_WALLED_WIDTH bits per row,
+                                                    # pre-shifted to every walled grid column: [piece_type][rotation][column]
+KICK_ROTATIONS = [None] * (len(TetrominoType) + 1) # SRS kick tests for the piece, [piece_type][from_rotation][to_rotation]
+for piece_type in TetrominoType:
+    base_shape = numpy.array(piece_type.shape, dtype=bool)
+    shapes = []
+    grid_masks = []
+    cells = []
+    row_bits = []
+    column_bottoms = []
+    packed = []
+    for quarter_turns in range(4):
+        shape = numpy.ascontiguousarray(numpy.rot90(base_shape, -quarter_turns))
+        grid_mask = numpy.ascontiguousarray(shape[::-1])
+        grid_mask.flags.writeable = False
+        shapes.append(tuple(map(tuple, shape.tolist())))
+        grid_masks.append(grid_mask)
+        cell_indices = numpy.nonzero(grid_mask) # Row-major, so drawing and locking keep the mask's cell order
+        for indices in cell_indices:
+            indices.flags.writeable = False
+        cells.append(cell_indices)
+        row_bits.append(tuple(sum(1 << local_x for local_x in numpy.flatnonzero(row).tolist()) for row in grid_mask))
+        packed_bits = sum(bits << (local_y * GRID_WALLED_WIDTH) for local_y, bits in enumerate(row_bits[-1]))
+        packed.append(tuple(packed_bits << column for column in range(GRID_WALLED_WIDTH)))
+        column_bottoms.append(tuple((local_x, int(numpy.argmax(column))) for local_x, column in enumerate(grid_mask.T) if column.any()))
+    SHAPE_ROTATIONS[piece_type] = tuple(shapes)
+    GRID_MASK_ROTATIONS[piece_type] = tuple(grid_masks)
+    CELL_ROTATIONS[piece_type] = tuple(cells)
+    ROW_BITS_ROTATIONS[piece_type] = tuple(row_bits)
+    COLUMN_BOTTOMS_ROTATIONS[piece_type] = tuple(column_bottoms)
+    PACKED_ROTATIONS[piece_type] = tuple(packed)
+    KICK_ROTATIONS[piece_type] = KICK_OFFSETS_I if piece_type == TetrominoType.I_PIECE else KICK_OFFSETS_JLSTZ
+# Frozen once built
+SHAPE_ROTATIONS = tuple(SHAPE_ROTATIONS)
+GRID_MASK_ROTATIONS = tuple(GRID_MASK_ROTATIONS)
+CELL_ROTATIONS = tuple(CELL_ROTATIONS)
+ROW_BITS_ROTATIONS = tuple(ROW_BITS_ROTATIONS)
+COLUMN_BOTTOMS_ROTATIONS = tuple(COLUMN_BOTTOMS_ROTATIONS)
+PACKED_ROTATIONS = tuple(PACKED_ROTATIONS)
+KICK_ROTATIONS = tuple(KICK_ROTATIONS)
 
 class Tetromino:
     def __init__(self, type : TetrominoType, grid_position = (0,0), rotation = 0):
         self.grid_position = grid_position
-        self.rotation = 0 # TODO : Make this an enum 0: Up 1: Down
+        self.rotation = rotation % 4 # Index into the precomputed rotations # TODO : Make this an enum 0: Up 1: Down
         self.type = TetrominoType(type)
-        self.shape_instance = copy.copy(type.shape)
 
+    @property
+    def shape_instance(self):
+        return SHAPE_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def grid_mask(self): # shape_instance flipped so [local_y][local_x] lines up with grid coordinates
+        return GRID_MASK_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def cells(self): # Local (y, x) offsets of the filled cells in grid_mask
+        return CELL_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def row_bits(self): # grid_mask packed into one bitmask per row, bottom row first
+        return ROW_BITS_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def packed_columns(self): # Whole mask as one int laid out like the packed collision board, per left column
+        return PACKED_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def kick_offsets(self): # Kick tests from the current rotation, indexed by the rotation being turned to
+        return KICK_ROTATIONS[self.type][self.rotation]
+
+    @property
+    def column_bottoms(self): # Lowest filled cell of each filled column, for finding where the piece lands
+        return COLUMN_BOTTOMS_ROTATIONS[self.type][self.rotation]
+
+
+PIECE_TYPES = tuple(TetrominoType) # Built once instead of list(TetrominoType) per pull
 
 class RandomBag:
-    def __init__(self, random_style):
+    def __init__(self, random_style, seed = None):
         self.random_style = random_style
+        self.rng = numpy.random.default_rng(seed) # Bag order comes from one permutation per 7 pieces
         self.contents = []
         self.next_piece = None
         self.current_piece = None
@@ -36,20 +115,18 @@ class RandomBag:
 
     def simple_random(self) -> TetrominoType:
         if self.next_piece is None: # Only happens the first time
-            self.next_piece = random.choice(list(TetrominoType))
+            self.next_piece = random.choice(PIECE_TYPES)
 
-        new_piece = random.choice(list(TetrominoType))
+        new_piece = random.choice(PIECE_TYPES)
         if new_piece == self.next_piece: # Reroll once
-            new_piece = random.choice(list(TetrominoType))
+            new_piece = random.choice(PIECE_TYPES)
 
         self.current_piece = self.next_piece
         self.next_piece = new_piece
         return self.current_piece
             
     def refill_bag(self):
-        new_bag = list(TetrominoType)
-        random.shuffle(new_bag)
-        self.contents = new_bag
+        self.contents = [PIECE_TYPES[index] for index in self.rng.permutation(len(PIECE_TYPES))]
         
         if self.next_piece is None: # Should happen only on the first bag fill 
             self.next_piece = self.contents.pop()
\ No newline at end of file
@@ -54,6 +54,7 @@ class Players:
         self._lock = Lock()
         self._global_listeners: List[InputHandler] = []
         self._last_hard_drop: Dict[str, float] = {}
+        self._version = 0  # Bumped whenever a player is added or removed
 
     HARD_DROP_COOLDOWN_SEC = 0.75  # prevent repeat hard-drops while held
 
@@ -89,12 +90,14 @@ class Players:
                 on_input=on_input,
             )
             self._players[player_id] = player
+            self._version += 1
             return player
 
     def unregister(self, player_id: str) -> None:
         """Remove a player completely (e.g., phone left the game page)."""
         with self._lock:
-            self._players.pop(player_id, None)
+            if self._players.pop(player_id, None) is not None:
+                self._version += 1
 
     def mark_disconnected(self, player_id: str) -> None:
         """Mark a player as offline without deleting its backlog."""
@@ -175,6 +178,16 @@ class Players:
         with self._lock:
             return list(self._players.values())
 
+    def get_player(self, player_id: str) -> Optional[Player]:
+        """Return the registered player, or None."""
+        with self._lock:
+            return self._players.get(player_id)
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever players are added or removed (for caching lookups)."""
+        return self._version
+
     def has_player(self, player_id: str) -> bool:
         with self._lock:
             return player_id in self._players
@@ -183,6 +196,7 @@ class Players:
         with self._lock:
             self._players.clear()
             self._global_listeners.clear()
+            self._version += 1
 
 
 # Module-level singleton and helpers so callers don't manage registry wiring
@@ -0,0 +1,17 @@
+import os
+import sys
+
+# Tests run without a display, and import modules the way main.py does (from the TwinklyWall directory)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pygame_display():
+    pygame.init()
+    pygame.display.set_mode((1, 1)) # Tetris converts its images, which needs a display mode
+    yield
+    pygame.quit()
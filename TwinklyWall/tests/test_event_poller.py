@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pygame
+import pytest
+
+import event_poller
+from event_poller import EventPoller
+
+
+@pytest.fixture(autouse=True)
+def quiet_log(monkeypatch):
+    monkeypatch.setattr(event_poller, "log", lambda *args, **kwargs: None)
+
+
+def test_draining_while_the_producer_appends_loses_and_repeats_nothing():
+    # One producer handing over batches and one consumer draining, as the poll thread and game loop do
+    poller = EventPoller()
+    total = 200000
+    batch_size = 7
+
+    def produce():
+        for start in range(0, total, batch_size):
+            poller.event_queue.extend(range(start, min(start + batch_size, total)))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    received = []
+    while producer.is_alive() or poller.has_events():
+        received.extend(poller.get_events())
+    producer.join()
+
+    assert received == list(range(total))
+    assert poller.queue_size() == 0
+
+
+def test_poll_thread_hands_over_every_posted_event_in_order():
+    pygame.event.clear()
+    poller = EventPoller()
+    poller.start()
+    try:
+        count = 500
+        for index in range(count):
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT, index=index))
+        received = []
+        deadline = time.monotonic() + 5
+        while len(received) < count and time.monotonic() < deadline:
+            received.extend(event.index for event in poller.get_events() if event.type == pygame.USEREVENT)
+            time.sleep(0.001)
+    finally:
+        poller.stop()
+
+    assert received == list(range(count))
+    assert poller.events_polled >= count
@@ -0,0 +1,111 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from dotmatrix.fpp_output import FPPOutput
+
+WIDTH, HEIGHT = 90, 50
+
+CORRECTIONS = [
+    dict(),
+    dict(gamma=2.2),
+    dict(color_order="GRB"),
+    dict(channel_gains=(0.5, 1.0, 0.8)),
+    dict(gamma=2.2, color_order="BGR", channel_gains=(0.9, 0.7, 1.0)),
+    dict(gamma=1.8, channel_gains=(1.3, 1.0, 0.6)),
+]
+
+
+@pytest.fixture
+def make_output(tmp_path, monkeypatch):
+    # No FPP here, so skip the overlay REST calls and map a scratch file instead of /dev/shm
+    monkeypatch.setattr(FPPOutput, "_enable_overlay_state", lambda self, model_name=None, state=3: True)
+    outputs = []
+
+    def make(**correction):
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = FPPOutput(WIDTH, HEIGHT, mapping_file=str(tmp_path / "FPP-Model-Data-Test"), **correction)
+        outputs.append(output)
+        return output
+
+    yield make
+    for output in outputs:
+        output.close()
+
+
+def float_correction(output, r, g, b):
+    """The per-pixel float math the writers ran before the level tables."""
+    order = [r, g, b]
+    r, g, b = (order[index] for index in output._channel_idx)
+    if output._identity_gains and not output._gamma_active:
+        return r, g, b
+    levels = [r * output.channel_gains[0], g * output.channel_gains[1], b * output.channel_gains[2]]
+    if output._gamma_active:
+        levels = [(max(0.0, min(255.0, level)) / 255.0) ** output.gamma * 255.0 for level in levels]
+    return tuple(int(max(0, min(255, round(level)))) for level in levels)
+
+
+def float_correction_numpy(output, arr_uint8):
+    """The per-frame float pass _apply_correction_numpy ran before the lookup tables."""
+    corrected = output._correct_levels_float(arr_uint8)
+    return corrected[:, list(output._channel_idx)]
+
+
+def write_quietly(output, *args, solid=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        (output.write_solid if solid else output.write)(*args)
+    return bytes(output.memory_map)
+
+
+def expected_frame_bytes(output, correct):
+    expected = bytearray(output.buffer_size)
+    for (row, col), byte_idx in output.routing_table.items():
+        expected[byte_idx:byte_idx + 3] = bytes(correct(row, col))
+    return bytes(expected)
+
+
+@pytest.mark.parametrize("correction", CORRECTIONS)
+def test_level_tables_match_the_float_path_for_every_level(make_output, correction):
+    output = make_output(**correction)
+    for level in range(256):
+        assert output._apply_correction_tuple(level, level, level) == float_correction(output, level, level, level)
+    levels = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+    assert np.array_equal(output._apply_correction_numpy(levels), float_correction_numpy(output, levels))
+
+
+@pytest.mark.parametrize("correction", CORRECTIONS)
+def test_numpy_frame_bytes_match_the_float_path(make_output, correction):
+    output = make_output(**correction)
+    frame = np.random.default_rng(0).integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    corrected = float_correction_numpy(output, frame.reshape(-1, 3)).reshape(HEIGHT, WIDTH, 3)
+
+    assert write_quietly(output, frame) == expected_frame_bytes(output, lambda row, col: corrected[row, col])
+
+
+@pytest.mark.parametrize("correction", CORRECTIONS)
+def test_list_frame_bytes_match_the_float_path(make_output, correction):
+    output = make_output(**correction)
+    rng = np.random.default_rng(1)
+    frame = [[tuple(int(v) for v in rng.integers(0, 256, 3)) for _ in range(WIDTH)] for _ in range(HEIGHT)]
+
+    assert write_quietly(output, frame) == expected_frame_bytes(output, lambda row, col: float_correction(output, *frame[row][col]))
+
+
+@pytest.mark.parametrize("correction", CORRECTIONS)
+def test_out_of_range_and_float_levels_are_clamped_like_the_float_path(make_output, correction):
+    output = make_output(**correction)
+    if output._level_tables is None:
+        pytest.skip("no correction, levels pass straight through")
+    for r, g, b in [(-20, 300, 12.6), (0.4, 254.9, -0.5), (1000, -1000, 128.0)]:
+        clamped = (max(0, min(255, int(c))) for c in (r, g, b))
+        assert output._apply_correction_tuple(r, g, b) == float_correction(output, *clamped)
+
+
+@pytest.mark.parametrize("correction", CORRECTIONS)
+def test_write_solid_fills_every_pixel_with_the_corrected_color(make_output, correction):
+    output = make_output(**correction)
+    pixel = float_correction(output, 10, 200, 30)
+
+    assert write_quietly(output, 10, 200, 30, solid=True) == bytes(pixel) * (output.buffer_size // 3)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+import game_players
+from game_players import GamePlayerManager
+from players import get_registry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(game_players.time, "monotonic", fake.monotonic)
+    return fake
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(game_players, "log", lambda *args, **kwargs: None)
+    monkeypatch.setattr(game_players, "GAME_LIMITS", {})
+    get_registry().clear_all()
+    yield GamePlayerManager()
+    get_registry().clear_all()
+
+
+def test_heap_expiry_removes_exactly_the_players_a_full_scan_finds_idle(manager, clock):
+    rng = random.Random(0)
+    player_ids = [f"player-{index}" for index in range(12)]
+    for _ in range(3000):
+        action = rng.random()
+        player_id = rng.choice(player_ids)
+        if action < 0.2:
+            manager.join(player_id, game=rng.choice(("tetris", "pong")))
+        elif action < 0.55:
+            if player_id in manager._last_heartbeat:
+                manager.heartbeat(player_id)
+        elif action < 0.6:
+            manager.leave(player_id)
+        elif action < 0.9:
+            clock.now += rng.uniform(0, 4)
+        else:
+            timeout_sec = rng.choice((0, 2.5, game_players.PLAYER_TIMEOUT_SEC))
+            expected = manager.get_idle_players(timeout_sec)
+            removed = []
+            leave = manager.leave
+            manager.leave = lambda player_id: (removed.append(player_id), leave(player_id))
+            manager.cleanup_idle(timeout_sec)
+            del manager.leave
+            assert sorted(removed) == sorted(expected) # Each idle player leaves once, however many heartbeats it sent
+            assert not set(manager.get_idle_players(timeout_sec))
+
+
+def test_cached_player_lists_follow_joins_leaves_and_registry_changes(manager, clock):
+    registry = get_registry()
+    rng = random.Random(1)
+    player_ids = [f"player-{index}" for index in range(8)]
+    for _ in range(2000):
+        action = rng.random()
+        player_id = rng.choice(player_ids)
+        if action < 0.3:
+            manager.join(player_id, game=rng.choice(("tetris", "pong")))
+        elif action < 0.45:
+            manager.leave(player_id)
+        elif action < 0.55:
+            registry.unregister(player_id) # Behind the manager's back, e.g. the phone left the page
+        elif action < 0.6:
+            registry.register(player_id)
+        for game in ("tetris", "pong"):
+            expected = [registry.get_player(pid) for pid in manager._active_by_game.get(game, ()) if registry.has_player(pid)]
+            cached = manager.get_active_players_for_game(game)
+            assert [id(player) for player in cached] == [id(player) for player in expected] # The registry's own objects
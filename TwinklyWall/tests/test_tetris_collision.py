@@ -0,0 +1,80 @@
+import numpy
+import pygame
+
+from games.tetris.tetris import Tetris
+from games.tetris.tetromino import Tetromino
+from games.tetris.enums import TetrominoType
+from games.tetris.constants import GRID_WIDTH, GRID_HEIGHT, MODERN_NEXT_LEVEL_BASE_GOAL
+
+
+def make_game():
+    game = Tetris(pygame.Surface((90, 100), pygame.SRCALPHA), True, 1, 1)
+    game.base_goal = MODERN_NEXT_LEVEL_BASE_GOAL # __level_up still reads this name
+    return game
+
+
+def set_board(game, dead_grid):
+    game.dead_grid[:] = dead_grid
+    game._Tetris__sync_occupied_rows()
+    game._Tetris__sync_column_tops()
+
+
+def fits(dead_grid, tetromino, position):
+    # Cells above the top row count as filled, like the padding of the packed board
+    x, y = position
+    for local_y, local_x in zip(*tetromino.cells):
+        grid_x, grid_y = x + int(local_x), y + int(local_y)
+        if not (0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT) or dead_grid[grid_y, grid_x]:
+            return False
+    return True
+
+
+def test_packed_board_collisions_match_a_cell_by_cell_check():
+    # Every position the game tests is at most a move, kick or drop step from a valid one, so check those
+    game = make_game()
+    rng = numpy.random.default_rng(0)
+    checked = 0
+    while checked < 20000:
+        dead_grid = numpy.zeros_like(game.dead_grid)
+        stack_height = int(rng.integers(0, GRID_HEIGHT))
+        dead_grid[:stack_height] = rng.random((stack_height, GRID_WIDTH)) < 0.3
+        set_board(game, dead_grid)
+        tetromino = Tetromino(TetrominoType(int(rng.integers(1, len(TetrominoType) + 1))), rotation=int(rng.integers(4)))
+        x, y = int(rng.integers(-1, GRID_WIDTH - 1)), int(rng.integers(-1, GRID_HEIGHT - 1))
+        if not fits(dead_grid, tetromino, (x, y)):
+            continue
+        game.live_tetromino = tetromino
+        for offset_x in range(-2, 3):
+            for offset_y in range(-2, 3):
+                position = (x + offset_x, y + offset_y)
+                assert game._Tetris__check_move_validity(position) == fits(dead_grid, tetromino, position), position
+                checked += 1
+
+
+def test_locking_keeps_the_bitboards_in_step_with_the_grid():
+    game = make_game()
+    rng = numpy.random.default_rng(1)
+    for drop in range(200):
+        if drop % 10 == 0:
+            # Fresh board with a two-wide gap down to two full rows, and an O piece over it, so lines get cleared
+            gap = int(rng.integers(0, GRID_WIDTH - 1))
+            dead_grid = numpy.zeros_like(game.dead_grid)
+            dead_grid[:2] = TetrominoType.T_PIECE.value
+            dead_grid[2:5] = rng.random((3, GRID_WIDTH)) < 0.3
+            dead_grid[:5, gap:gap + 2] = 0
+            set_board(game, dead_grid)
+            game.live_tetromino = Tetromino(TetrominoType.O_PIECE, grid_position=(gap - 1, GRID_HEIGHT - 4))
+        else:
+            for _ in range(int(rng.integers(0, 3))):
+                game.rotate_clockwise()
+            move = game.move_piece_left if rng.integers(2) else game.move_piece_right
+            for _ in range(int(rng.integers(0, 5))):
+                move()
+        game.hard_drop_piece()
+        for _ in range(10): # Lets line clears finish
+            game.tick(0.05, 20)
+        if not game.is_playing:
+            break
+        occupied_rows, occupied_board, column_tops = game.occupied_rows, game.occupied_board, game.column_tops
+        set_board(game, game.dead_grid.copy()) # Rebuilt from scratch
+        assert (occupied_rows, occupied_board, column_tops) == (game.occupied_rows, game.occupied_board, game.column_tops)
@@ -0,0 +1,94 @@
+import numpy
+import pygame
+import pytest
+
+from games.tetris.tetris import Tetris
+from games.tetris.tetromino import Tetromino
+from games.tetris.enums import TetrominoType
+from games.tetris.constants import GRID_WIDTH, GRID_HEIGHT
+
+
+def make_game(gamemode=1):
+    return Tetris(pygame.Surface((90, 100), pygame.SRCALPHA), True, 1, gamemode)
+
+
+def set_board(game, dead_grid):
+    game.dead_grid[:] = dead_grid
+    game._Tetris__sync_occupied_rows()
+    game._Tetris__sync_column_tops()
+
+
+def fits(dead_grid, tetromino, position):
+    x, y = position
+    for local_y, local_x in zip(*tetromino.cells):
+        grid_x, grid_y = x + int(local_x), y + int(local_y)
+        if not (0 <= grid_x < GRID_WIDTH and 0 <= grid_y) or (grid_y < GRID_HEIGHT and dead_grid[grid_y, grid_x]):
+            return False
+    return True
+
+
+def brute_force_landing_distance(dead_grid, tetromino):
+    # Step down a row at a time until the next row no longer fits
+    x, y = tetromino.grid_position
+    distance = 0
+    while fits(dead_grid, tetromino, (x, y - distance - 1)):
+        distance += 1
+    return distance
+
+
+def random_placements(rng, count, max_stack_height=12, fill=0.35):
+    # Boards filled at random rather than stacked, so pieces also end up tucked under overhangs
+    for _ in range(count):
+        dead_grid = numpy.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=numpy.uint8)
+        stack_height = int(rng.integers(0, max_stack_height))
+        dead_grid[:stack_height] = rng.random((stack_height, GRID_WIDTH)) < fill
+        tetromino = Tetromino(TetrominoType(int(rng.integers(1, len(TetrominoType) + 1))), rotation=int(rng.integers(4)))
+        position = (int(rng.integers(-1, GRID_WIDTH - 1)), int(rng.integers(-1, GRID_HEIGHT - 4)))
+        if fits(dead_grid, tetromino, position):
+            tetromino.grid_position = position
+            yield dead_grid, tetromino
+
+
+def test_landing_distance_matches_a_row_by_row_drop():
+    game = make_game()
+    rng = numpy.random.default_rng(0)
+    for dead_grid, tetromino in random_placements(rng, 3000):
+        set_board(game, dead_grid)
+        game.live_tetromino = tetromino
+        assert game._Tetris__landing_distance() == brute_force_landing_distance(dead_grid, tetromino)
+
+
+def looped_hard_drop(game, was_player_called):
+    # The hard drop as it was before it snapped: one __drop_tetromino per row, then lock
+    for _ in range(game._Tetris__landing_distance()):
+        if game._Tetris__drop_tetromino() and was_player_called:
+            game._Tetris__award_score(2)
+    game._Tetris__lock_piece()
+
+
+def game_state(game):
+    live = game.live_tetromino
+    return (game.dead_grid.tolist(), game.score, game.soft_drop_streak, game.cannot_move_down, game.down_time_elapsed,
+            game.moves_while_down, game.column_tops, game.occupied_board, (live.type, live.grid_position, live.rotation))
+
+
+@pytest.mark.parametrize("gamemode", (0, 1))
+def test_hard_drop_matches_the_row_by_row_loop(gamemode):
+    snapped, looped = make_game(gamemode), make_game(gamemode)
+    rng = numpy.random.default_rng(gamemode)
+    for dead_grid, tetromino in random_placements(rng, 800, max_stack_height=8, fill=0.3):
+        was_player_called = bool(rng.integers(2))
+        cannot_move_down = bool(rng.integers(2))
+        is_soft_dropping = bool(rng.integers(2))
+        for game in (snapped, looped):
+            set_board(game, dead_grid)
+            game.live_tetromino = Tetromino(tetromino.type, tetromino.grid_position, tetromino.rotation)
+            game.randomizer.next_piece = TetrominoType.T_PIECE # Both games spawn the same piece after locking
+            game.randomizer.contents = [TetrominoType.T_PIECE]
+            game.score = game.soft_drop_streak = game.moves_while_down = 0
+            game.down_time_elapsed = 0.25
+            game.cannot_move_down = cannot_move_down
+            game.is_soft_dropping = is_soft_dropping
+        snapped._Tetris__hard_drop_tetromino(was_player_called=was_player_called)
+        looped_hard_drop(looped, was_player_called)
+        assert game_state(snapped) == game_state(looped)
@@ -0,0 +1,26 @@
+import pygame
+import pytest
+
+from games.tetris.tetris import Tetris
+
+
+def make_game(gamemode):
+    return Tetris(pygame.Surface((90, 100), pygame.SRCALPHA), True, 1, gamemode)
+
+
+@pytest.mark.parametrize("gamemode", (0, 1))
+def test_move_down_is_a_single_step(gamemode):
+    game = make_game(gamemode)
+    x, y = game.live_tetromino.grid_position
+    drop_interval = game.drop_interval
+    Tetris._INPUT_COMMANDS["MOVE_DOWN"](game)
+    assert game.live_tetromino.grid_position == (x, y - 1)
+    assert game.drop_interval == drop_interval # The phone never sends a release, so nothing may stay held down
+
+
+def test_classic_move_down_leaves_no_soft_drop_running():
+    game = make_game(0)
+    for _ in range(3):
+        Tetris._INPUT_COMMANDS["MOVE_DOWN"](game)
+    assert not game.is_soft_dropping
+    assert game.soft_drop_streak == 0
@@ -0,0 +1,57 @@
+import numpy
+import pytest
+
+pytest.importorskip("numba")
+
+from games.tetris import tetris
+from games.tetris.tetromino import Tetromino
+from games.tetris.enums import TetrominoType
+from games.tetris.constants import GRID_WIDTH, GRID_HEIGHT, GRID_WALL_PADDING, GRID_WALL_VALUE, GRID_WALLED_WIDTH
+
+
+def random_dead_grid(rng):
+    # A view into a walled grid, laid out like Tetris.dead_grid
+    walled_grid = numpy.full((GRID_HEIGHT + 2 * GRID_WALL_PADDING, GRID_WALLED_WIDTH), GRID_WALL_VALUE, dtype=numpy.uint8)
+    dead_grid = walled_grid[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT, GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH]
+    dead_grid[:] = rng.integers(0, len(TetrominoType) + 1, size=dead_grid.shape) * (rng.random(dead_grid.shape) < 0.5)
+    return walled_grid, dead_grid
+
+
+def test_numba_kernels_are_the_ones_in_use():
+    assert tetris.HAS_NUMBA
+    assert tetris._lock_cells is not tetris._lock_cells_numpy
+    assert tetris._remove_rows is not tetris._remove_rows_numpy
+
+
+def test_lock_kernel_matches_the_numpy_fallback():
+    rng = numpy.random.default_rng(0)
+    for _ in range(500):
+        piece = Tetromino(TetrominoType(int(rng.integers(1, len(TetrominoType) + 1))), rotation=int(rng.integers(4)))
+        local_y, local_x = piece.cells
+        x = int(rng.integers(-local_x.min(), GRID_WIDTH - local_x.max()))
+        y = int(rng.integers(-local_y.min(), GRID_HEIGHT - local_y.max()))
+        walled_grid, dead_grid = random_dead_grid(rng)
+        expected_walled = walled_grid.copy()
+        expected_dead = expected_walled[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT, GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH]
+
+        top_row = tetris._lock_cells(dead_grid, local_y, local_x, x, y, piece.type.value)
+        expected_top_row = tetris._lock_cells_numpy(expected_dead, local_y, local_x, x, y, piece.type.value)
+
+        assert top_row == expected_top_row
+        assert numpy.array_equal(walled_grid, expected_walled) # Walls untouched too
+
+
+@pytest.mark.parametrize("full_row_count", [0, 1, 2, 3, 4, GRID_HEIGHT // 2, GRID_HEIGHT])
+def test_line_clear_kernel_matches_the_numpy_fallback(full_row_count):
+    rng = numpy.random.default_rng(full_row_count)
+    for _ in range(100):
+        walled_grid, dead_grid = random_dead_grid(rng)
+        full_rows = numpy.sort(rng.choice(GRID_HEIGHT, size=full_row_count, replace=False)).astype(numpy.intp)
+        dead_grid[full_rows] = rng.integers(1, len(TetrominoType) + 1, size=(full_row_count, GRID_WIDTH))
+        expected_walled = walled_grid.copy()
+        expected_dead = expected_walled[GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_HEIGHT, GRID_WALL_PADDING:GRID_WALL_PADDING + GRID_WIDTH]
+
+        tetris._remove_rows(dead_grid, full_rows)
+        tetris._remove_rows_numpy(expected_dead, full_rows)
+
+        assert numpy.array_equal(walled_grid, expected_walled)
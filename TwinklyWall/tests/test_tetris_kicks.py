@@ -0,0 +1,126 @@
+import numpy
+import pygame
+import pytest
+
+from games.tetris.tetris import Tetris
+from games.tetris.tetromino import Tetromino, SHAPE_ROTATIONS, KICK_ROTATIONS
+from games.tetris.enums import TetrominoType
+from games.tetris.constants import GRID_WIDTH, GRID_HEIGHT
+
+# SRS offset data as published (x, y with +y up), one row per state 0, R, 2, L. The kick for a turn is
+# offset[from] - offset[to] for each of the five tests.
+SRS_OFFSETS_JLSTZ = (
+    ((0,0), (0,0), (0,0), (0,0), (0,0)),
+    ((0,0), (1,0), (1,-1), (0,2), (1,2)),
+    ((0,0), (0,0), (0,0), (0,0), (0,0)),
+    ((0,0), (-1,0), (-1,-1), (0,2), (-1,2)),
+)
+SRS_OFFSETS_I = (
+    ((0,0), (-1,0), (2,0), (-1,0), (2,0)),
+    ((-1,0), (0,0), (0,0), (0,1), (0,-2)),
+    ((-1,1), (1,1), (-2,1), (1,0), (-2,0)),
+    ((0,1), (0,1), (0,1), (0,-1), (0,2)),
+)
+# SRS states of the I piece in its 4x4 box, top row first
+SRS_I_STATES = (
+    ((0,0,0,0), (1,1,1,1), (0,0,0,0), (0,0,0,0)),
+    ((0,0,1,0), (0,0,1,0), (0,0,1,0), (0,0,1,0)),
+    ((0,0,0,0), (0,0,0,0), (1,1,1,1), (0,0,0,0)),
+    ((0,1,0,0), (0,1,0,0), (0,1,0,0), (0,1,0,0)),
+)
+SRS_T_STATES = (
+    ((0,1,0), (1,1,1), (0,0,0)),
+    ((0,1,0), (0,1,1), (0,1,0)),
+    ((0,0,0), (1,1,1), (0,1,0)),
+    ((0,1,0), (1,1,0), (0,1,0)),
+)
+KICKED_PIECES = [piece_type for piece_type in TetrominoType if piece_type != TetrominoType.O_PIECE]
+
+
+def srs_state(piece_type, rotation):
+    # The I piece's base shape is the SRS 2 state, every other piece starts in state 0
+    return (rotation + 2) % 4 if piece_type == TetrominoType.I_PIECE else rotation
+
+
+def srs_kicks(piece_type, from_rotation, to_rotation):
+    offsets = SRS_OFFSETS_I if piece_type == TetrominoType.I_PIECE else SRS_OFFSETS_JLSTZ
+    start, end = offsets[srs_state(piece_type, from_rotation)], offsets[srs_state(piece_type, to_rotation)]
+    kicks = [(sx - ex, sy - ey) for (sx, sy), (ex, ey) in zip(start, end)]
+    # The box already turns about the I piece's true center, so the first offset (SRS's pivot shift) is not a kick
+    first_x, first_y = kicks[0]
+    return tuple((kick_x - first_x, kick_y - first_y) for kick_x, kick_y in kicks)
+
+
+def make_game():
+    return Tetris(pygame.Surface((90, 100), pygame.SRCALPHA), True, 1, 1)
+
+
+def set_board(game, dead_grid):
+    game.dead_grid[:] = dead_grid
+    game._Tetris__sync_occupied_rows()
+    game._Tetris__sync_column_tops()
+
+
+def fits(dead_grid, tetromino, position):
+    x, y = position
+    for local_y, local_x in zip(*tetromino.cells):
+        grid_x, grid_y = x + int(local_x), y + int(local_y)
+        if not (0 <= grid_x < GRID_WIDTH and 0 <= grid_y) or (grid_y < GRID_HEIGHT and dead_grid[grid_y, grid_x]):
+            return False
+    return True
+
+
+@pytest.mark.parametrize("piece_type", KICKED_PIECES)
+def test_kick_tables_match_the_srs_offsets(piece_type):
+    for from_rotation in range(4):
+        for to_rotation in range(4):
+            kicks = KICK_ROTATIONS[piece_type][from_rotation][to_rotation]
+            if (to_rotation - from_rotation) % 2 == 0:
+                assert kicks is None
+            else:
+                assert kicks == srs_kicks(piece_type, from_rotation, to_rotation), (from_rotation, to_rotation)
+
+
+def test_rotations_match_the_srs_states():
+    for rotation in range(4):
+        assert SHAPE_ROTATIONS[TetrominoType.I_PIECE][rotation] == tuple(tuple(map(bool, row)) for row in SRS_I_STATES[srs_state(TetrominoType.I_PIECE, rotation)])
+        assert SHAPE_ROTATIONS[TetrominoType.T_PIECE][rotation] == tuple(tuple(map(bool, row)) for row in SRS_T_STATES[rotation])
+
+
+def test_t_piece_kicks_off_the_left_wall():
+    # T in state R pushed against the left wall has its box one column past it. Turning to 2 fails in place
+    # and takes the second R->2 test, one column right.
+    game = make_game()
+    game.live_tetromino = Tetromino(TetrominoType.T_PIECE, grid_position=(-1, 10), rotation=1)
+    assert game._Tetris__rotate_tetromino(clockwise=True)
+    assert (game.live_tetromino.rotation, game.live_tetromino.grid_position) == (2, (0, 10))
+
+
+@pytest.mark.parametrize("piece_type", KICKED_PIECES)
+@pytest.mark.parametrize("clockwise", (True, False))
+def test_rotation_takes_the_first_srs_test_that_fits(piece_type, clockwise):
+    game = make_game()
+    rng = numpy.random.default_rng(int(piece_type) * 2 + clockwise)
+    for _ in range(300):
+        dead_grid = numpy.zeros_like(game.dead_grid)
+        stack_height = int(rng.integers(0, 8))
+        dead_grid[:stack_height] = rng.random((stack_height, GRID_WIDTH)) < 0.45
+        rotation = int(rng.integers(4))
+        tetromino = Tetromino(piece_type, rotation=rotation)
+        start = (int(rng.integers(-1, GRID_WIDTH - 1)), int(rng.integers(0, 9)))
+        if not fits(dead_grid, tetromino, start):
+            continue
+        set_board(game, dead_grid)
+        game.live_tetromino = tetromino
+        tetromino.grid_position = start
+
+        target = (rotation + (1 if clockwise else 3)) % 4
+        turned = Tetromino(piece_type, rotation=target)
+        expected = next(((start[0] + kick_x, start[1] + kick_y) for kick_x, kick_y in srs_kicks(piece_type, rotation, target)
+                         if fits(dead_grid, turned, (start[0] + kick_x, start[1] + kick_y))), None)
+
+        assert game._Tetris__rotate_tetromino(clockwise=clockwise) == (expected is not None)
+        if expected is None:
+            assert (tetromino.rotation, tetromino.grid_position) == (rotation, start)
+        else:
+            assert (tetromino.rotation, tetromino.grid_position) == (target, expected)
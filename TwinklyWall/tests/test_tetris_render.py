@@ -0,0 +1,183 @@
+import copy
+import random
+
+import pygame
+import pytest
+
+from games.tetris.tetris import Tetris
+from games.tetris.tetromino import Tetromino, RandomBag
+from games.tetris.enums import TetrominoType
+from games.tetris.constants import (
+    GRID_WIDTH, GRID_HEIGHT, GRID_PIXEL_SIZE, GRID_WALL_PADDING, BORDER_COLOR, BORDER_THICKNESS, FULL_OPACITY_ALPHA, RGB_WHITE,
+    RGBA_INVISIBLE_BLACK, RGBA_OFF_PIXEL_GRAY, TETROMINO_COLORS, TETROMINO_GHOST_ALPHA, MODERN_NEXT_LEVEL_BASE_GOAL,
+)
+
+WALL_CANVAS_SIZES = ((90, 100), (90, 50)) # 90x50 cuts off the top rows, which then overlap their neighbours
+# Canvases whose fractional offsets truncate some rows (91x47) or columns (58x47) a pixel off the grid image's
+# stride, leaving overlaps and one pixel gaps between cells
+REFERENCE_CANVAS_SIZES = (*WALL_CANVAS_SIZES, (270, 150), (91, 47), (58, 47), (64, 80))
+
+
+def make_game(size, gamemode):
+    game = Tetris(pygame.Surface(size, pygame.SRCALPHA), True, 1, gamemode)
+    game.base_goal = MODERN_NEXT_LEVEL_BASE_GOAL # __level_up still reads this name
+    return game
+
+
+def twin_games(size, gamemode, seed=0):
+    # Two games in the same state: one repaints incrementally, the other is forced to redraw fully every tick
+    partial = make_game(size, gamemode)
+    full = make_game(size, gamemode)
+    partial.randomizer = RandomBag(partial.randomizer.random_style, seed) # The bag is unseeded by default
+    partial._Tetris__spawn_tetromino()
+    full.randomizer = copy.deepcopy(partial.randomizer)
+    live = partial.live_tetromino
+    full.live_tetromino = Tetromino(live.type, live.grid_position, live.rotation)
+    return partial, full
+
+
+def play(game, action):
+    if action < 0.1:
+        game.move_piece_left()
+    elif action < 0.2:
+        game.move_piece_right()
+    elif action < 0.27:
+        game.rotate_clockwise()
+    elif action < 0.3:
+        game.rotate_counterclockwise()
+    elif action < 0.33:
+        game.drop_piece(True)
+    elif action < 0.35:
+        game.hard_drop_piece()
+
+
+def assert_partial_matches_full(size, gamemode, seed, ticks, with_input):
+    partial, full = twin_games(size, gamemode, seed)
+    inputs = random.Random(seed)
+    random.seed(seed)
+    for tick in range(ticks):
+        action = inputs.random()
+        state = random.getstate() # Classic pulls pieces from the global random, both games must see the same draws
+        for game in (partial, full):
+            random.setstate(state)
+            if with_input:
+                play(game, action)
+            if game is full:
+                game.full_redraw_needed = True
+            game.tick(0.05, 20)
+        assert partial.dead_grid.tolist() == full.dead_grid.tolist()
+        assert pygame.image.tobytes(partial.screen, "RGBA") == pygame.image.tobytes(full.screen, "RGBA"), f"tick {tick}"
+        if not partial.is_playing:
+            break
+
+
+@pytest.mark.parametrize("size", WALL_CANVAS_SIZES)
+@pytest.mark.parametrize("seed", (*range(8), 17, 58, 78)) # 17, 58 and 78 reach the overlapping rows on the 90x50 canvas
+def test_modern_partial_repaint_matches_full_redraw(size, seed):
+    assert_partial_matches_full(size, 1, seed, ticks=1500, with_input=True)
+
+
+@pytest.mark.parametrize("size", WALL_CANVAS_SIZES)
+@pytest.mark.parametrize("seed", range(4))
+def test_classic_partial_repaint_matches_full_redraw(size, seed):
+    assert_partial_matches_full(size, 0, seed, ticks=600, with_input=False)
+
+
+def test_repaint_under_a_cut_off_row_keeps_the_overlapping_pixels():
+    # On the 90x50 canvas row 16 is cut off to pixel rows 0..2 and row 15 sits at 2..4. Moving a piece out of
+    # row 15 must not repaint pixel row 2 with row 15's empty cell, a full redraw shows row 16 there.
+    partial, full = twin_games((90, 50), 1)
+    for game in (partial, full):
+        game.dead_grid[16, :-1] = TetrominoType.T_PIECE.value # Left over in the cut-off row, with a gap so it never clears
+        game._Tetris__sync_occupied_rows()
+        game._Tetris__sync_column_tops()
+        game.live_tetromino = Tetromino(TetrominoType.O_PIECE, grid_position=(2, 13)) # Cells in rows 14 and 15
+    for step in range(3):
+        for game in (partial, full):
+            if step:
+                game.move_piece_right()
+            if game is full:
+                game.full_redraw_needed = True
+            game.tick(0, 20)
+        assert pygame.image.tobytes(partial.screen, "RGBA") == pygame.image.tobytes(full.screen, "RGBA"), f"step {step}"
+
+
+def test_piece_cells_above_the_canvas_are_clipped_not_moved():
+    # On 91x47 row 15 starts one pixel above the canvas. Surface.fill moves such a rect down onto the canvas,
+    # which painted the piece over row 14's pixels; draw.rect clips it to the two visible pixel rows.
+    game = make_game((91, 47), 1)
+    game.live_tetromino = Tetromino(TetrominoType.O_PIECE, grid_position=(2, 14)) # Cells in rows 15 and 16
+    game.tick(0, 20)
+    x_position = game.column_pixels[3 + GRID_WALL_PADDING]
+    assert game.row_pixels[15 + GRID_WALL_PADDING] == -1
+    assert tuple(game.screen.get_at((x_position, 1))) == (*TETROMINO_COLORS[TetrominoType.O_PIECE.value], 255)
+    assert tuple(game.screen.get_at((x_position, 2))) == (*TETROMINO_COLORS[0], 255) # Row 14, still empty
+
+
+def reference_frame(game):
+    """Draw the game's current state the way the original cell by cell renderer did."""
+    screen = pygame.Surface(game.screen.get_size(), pygame.SRCALPHA)
+    screen.fill(RGBA_INVISIBLE_BLACK if game.headless else RGBA_OFF_PIXEL_GRAY)
+
+    def draw_square(color, position, alpha=FULL_OPACITY_ALPHA):
+        if len(color) == 3:
+            color = (*color, alpha)
+        pygame.draw.rect(screen, color, (position[0], position[1], GRID_PIXEL_SIZE, GRID_PIXEL_SIZE))
+
+    def draw_tetromino(position, tetromino, opacity=FULL_OPACITY_ALPHA):
+        shape = tetromino.shape_instance
+        size = tetromino.type.size
+        for local_y, grid_y in enumerate(range(position[1], position[1] + size)):
+            y_position = (GRID_HEIGHT - grid_y + game.game_y_offset) * GRID_PIXEL_SIZE
+            for local_x, grid_x in enumerate(range(position[0], position[0] + size)):
+                x_position = (grid_x + game.game_x_offset) * GRID_PIXEL_SIZE
+                if shape[-local_y + size - 1][local_x]:
+                    draw_square(tetromino.type.color, (x_position, y_position), opacity)
+
+    for y_index, row in enumerate(game.dead_grid.tolist()):
+        y_position = (GRID_HEIGHT - y_index + game.game_y_offset) * GRID_PIXEL_SIZE
+        for x_index, cell_index in enumerate(row):
+            draw_square(TETROMINO_COLORS[cell_index], ((x_index + game.game_x_offset) * GRID_PIXEL_SIZE, y_position))
+
+    live = game.live_tetromino
+    position = live.grid_position
+    for y in range(position[1], -live.type.size, -1):
+        position = (position[0], y)
+        if not game._Tetris__check_move_validity(position):
+            position = (position[0], y + 1)
+            break
+    draw_tetromino(position, live, TETROMINO_GHOST_ALPHA)
+
+    width, height = GRID_PIXEL_SIZE * GRID_WIDTH, GRID_PIXEL_SIZE
+    for line_y, alpha, _ in game.fading_lines:
+        layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(layer, (*RGB_WHITE, alpha), (0, 0, width, height))
+        layer.set_alpha(alpha)
+        start = (game.game_x_offset * GRID_PIXEL_SIZE, (GRID_HEIGHT - line_y + game.game_y_offset) * GRID_PIXEL_SIZE)
+        screen.blit(layer, (*start, width, height))
+
+    x_left = int(game.game_x_offset * GRID_PIXEL_SIZE) - BORDER_THICKNESS
+    x_right = int(game.game_x_offset * GRID_PIXEL_SIZE + (GRID_WIDTH * GRID_PIXEL_SIZE))
+    pygame.draw.rect(screen, BORDER_COLOR, (x_left, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE))
+    pygame.draw.rect(screen, BORDER_COLOR, (x_right, 0, BORDER_THICKNESS, GRID_HEIGHT * GRID_PIXEL_SIZE))
+
+    draw_tetromino(live.grid_position, live)
+    return screen
+
+
+@pytest.mark.parametrize("size", REFERENCE_CANVAS_SIZES)
+@pytest.mark.parametrize("gamemode", (0, 1))
+@pytest.mark.parametrize("seed", range(3))
+def test_frames_match_the_cell_by_cell_renderer(size, gamemode, seed):
+    game, _ = twin_games(size, gamemode, seed)
+    inputs = random.Random(seed)
+    random.seed(seed)
+    for tick in range(800):
+        action = inputs.random()
+        if gamemode == 1: # Classic input reaches lock delay state classic never sets up, so classic runs on gravity alone
+            play(game, action)
+        game.tick(0.05, 20)
+        if not game.is_playing:
+            break
+        expected = pygame.image.tobytes(reference_frame(game), "RGBA")
+        assert pygame.image.tobytes(game.screen, "RGBA") == expected, f"tick {tick}"